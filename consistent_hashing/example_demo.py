@@ -9,13 +9,30 @@ This script demonstrates how to:
 4. Show consistent hashing in action
 """
 
-import subprocess
+import atexit
+import multiprocessing
+import multiprocessing.connection
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import signal
+import socket
+import tempfile
 import sys
-from typing import List, Optional, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Any, Set
+from urllib.parse import urlsplit
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    from json import loads as json_loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=asdict).encode()
 
 import sys
 import os
@@ -23,66 +40,208 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'storage', 'kvstore'))
 from kvstore_service import KVStoreClient
 
 
+# Shared HTTP session so repeated probes against the gateway reuse
+# keep-alive connections instead of opening a new socket per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+atexit.register(SESSION.close)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Failures expected from a gateway request: network errors and malformed
+# responses. Anything else (including KeyboardInterrupt) propagates.
+REQUEST_ERRORS = (requests.RequestException, ValueError, KeyError)
+
+# Number of concurrent client requests issued by the demos
+DEMO_WORKERS = 16
+
+
+
+@dataclass(slots=True)
+class User:
+    name: str
+    age: int
+
+
+@dataclass(slots=True)
+class Product:
+    name: str
+    price: float
+
+
+@dataclass(slots=True)
+class Order:
+    user_id: int
+    product_id: int
+    quantity: int
+
+
+# Sample records for the basic operations demo, JSON-encoded once at import
+TEST_DATA = {
+    "user:1001": User("Alice", 25),
+    "user:1002": User("Bob", 30),
+    "user:1003": User("Charlie", 28),
+    "product:2001": Product("Laptop", 999.99),
+    "product:2002": Product("Mouse", 29.99),
+    "order:3001": Order(user_id=1001, product_id=2001, quantity=1)
+}
+TEST_PAYLOADS = {key: json_dumps(value) for key, value in TEST_DATA.items()}
+
+
+def post_json(url: str, payload: Any, timeout: float = 5) -> requests.Response:
+    """POST a JSON body encoded with the fast serializer"""
+    return SESSION.post(url, data=json_dumps(payload), headers=JSON_HEADERS, timeout=timeout)
+
+
+def redirect_stdio(log_path: str):
+    """Detach a service process from the demo's console.
+    
+    stdin/stdout go to /dev/null and stderr (where service logs are written)
+    goes to a per-service log file, so service logging does not contend with
+    the demo's own output.
+    """
+    devnull = os.open(os.devnull, os.O_RDWR)
+    log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.dup2(log_fd, 2)
+    os.close(devnull)
+    os.close(log_fd)
+
+
+def run_gateway(gateway_id: str, port: int, raft_port: int, peers: List[str], log_path: str):
+    """Process entry point for a gateway service"""
+    redirect_stdio(log_path)
+    from gateway.gateway_service import GatewayService
+    
+    gateway = GatewayService(gateway_id=gateway_id, listen_port=port,
+                             raft_port=raft_port, peer_gateways=peers)
+    try:
+        gateway.start()
+    except KeyboardInterrupt:
+        gateway.stop()
+
+
+def run_kvstore(node_id: str, port: int, gateway: str, log_path: str):
+    """Process entry point for a KV store service"""
+    redirect_stdio(log_path)
+    from kvstore_service import KVStoreService
+    
+    kvstore = KVStoreService(node_id=node_id, listen_port=port, gateway_address=gateway)
+    try:
+        kvstore.start()
+    except KeyboardInterrupt:
+        kvstore.stop()
+
+
 class ProcessManager:
     """Manages multiple processes for the demo"""
     
     def __init__(self):
-        self.processes: List[subprocess.Popen[bytes]] = []
+        self.processes: List[multiprocessing.Process] = []
+        self.log_dir = tempfile.mkdtemp(prefix="consistent_hashing_demo_")
+        print(f"Service logs are written to {self.log_dir}")
         
-    def start_gateway(self, gateway_id: str, port: int, raft_port: int, peers: Optional[List[str]] = None):
-        """Start a gateway service"""
-        cmd = [
-            "python", "gateway/gateway_service.py",
-            "--gateway-id", gateway_id,
-            "--port", str(port),
-            "--raft-port", str(raft_port)
-        ]
+        # Fork services from a server that has already imported their heavy
+        # dependencies, instead of starting a fresh interpreter per service
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("forkserver")
+            self.context.set_forkserver_preload(["flask", "requests", "gateway.gateway_service", "kvstore_service"])
+        else:
+            self.context = multiprocessing.get_context("spawn")
         
-        if peers:
-            cmd.extend(["--peers"] + peers)
-            
-        print(f"Starting gateway {gateway_id} on port {port}")
-        process = subprocess.Popen(cmd)
+    def _start(self, target, *args) -> multiprocessing.Process:
+        process = self.context.Process(target=target, args=args)
+        process.start()
         self.processes.append(process)
         return process
         
+    def start_gateway(self, gateway_id: str, port: int, raft_port: int, peers: Optional[List[str]] = None):
+        """Start a gateway service"""
+        print(f"Starting gateway {gateway_id} on port {port}")
+        return self._start(run_gateway, gateway_id, port, raft_port, peers or [], self.log_path(gateway_id))
+        
     def start_kvstore(self, node_id: str, port: int, gateway: str):
         """Start a KV store service"""
-        cmd = [
-            "python", "storage/kvstore/kvstore_service.py",
-            "--node-id", node_id,
-            "--port", str(port),
-            "--gateway", gateway
-        ]
-        
         print(f"Starting KV store {node_id} on port {port}")
-        process = subprocess.Popen(cmd)
-        self.processes.append(process)
-        return process
+        return self._start(run_kvstore, node_id, port, gateway, self.log_path(node_id))
+        
+    def log_path(self, service_id: str) -> str:
+        """Path of the log file a service's stderr is written to"""
+        return os.path.join(self.log_dir, f"{service_id}.log")
         
     def stop_all(self):
         """Stop all managed processes"""
         print("Stopping all processes...")
+        # Signal every process first so they all shut down in parallel,
+        # then wait against a single shared deadline
+        for process in self.processes:
+            process.terminate()
+        deadline = time.time() + 5
         for process in self.processes:
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+            process.join(timeout=max(0, deadline - time.time()))
+            if process.is_alive():
                 process.kill()
         self.processes.clear()
 
 
-def wait_for_service(url: str, timeout: int = 30) -> bool:
-    """Wait for a service to become available"""
+def wait_for_service(url: str, timeout: int = 30,
+                     process: Optional[multiprocessing.Process] = None) -> bool:
+    """Wait for a service to become available, backing off between probes.
+    
+    If the service's process is given, the wait ends as soon as that process
+    exits instead of probing a dead service until the timeout.
+    """
+    parsed = urlsplit(url)
+    address = (parsed.hostname, parsed.port or 80)
     start_time = time.time()
+    delay = 0.05
     while time.time() - start_time < timeout:
         try:
-            response = requests.get(url, timeout=2)
-            if response.status_code == 200:
+            # A bare TCP connect is the cheapest "is it listening" check;
+            # only once it succeeds confirm the endpoint with a HEAD request
+            socket.create_connection(address, timeout=0.2).close()
+            response = SESSION.head(url, timeout=1)
+            if 200 <= response.status_code < 300 or response.status_code == 405:
                 return True
-        except:
+        except (OSError, requests.RequestException):
             pass
-        time.sleep(1)
+        if process is None:
+            time.sleep(delay)
+        elif multiprocessing.connection.wait([process.sentinel], timeout=delay):
+            print(f"Process for {url} exited with code {process.exitcode}")
+            return False
+        delay = min(1.0, delay * 2)
+    return False
+
+
+def wait_for_services(urls: List[str], timeout: int = 30,
+                      processes: Optional[List[multiprocessing.Process]] = None) -> List[bool]:
+    """Wait for several services concurrently; returns readiness per URL"""
+    processes = processes or [None] * len(urls)
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return list(executor.map(lambda url, process: wait_for_service(url, timeout, process), urls, processes))
+
+
+def get_ring_nodes(status_url: str) -> Optional[Set[str]]:
+    """Return the set of node IDs currently in the gateway's ring"""
+    try:
+        response = SESSION.get(status_url, timeout=2)
+        if response.status_code == 200:
+            return set(json_loads(response.content)["ring_nodes"])
+    except REQUEST_ERRORS:
+        pass
+    return None
+
+
+def wait_for_ring_change(status_url: str, previous: Set[str], timeout: int = 45) -> bool:
+    """Wait until the ring membership differs from a previous snapshot"""
+    start_time = time.time()
+    while time.time() - start_time < timeout:
+        current = get_ring_nodes(status_url)
+        if current is not None and current != previous:
+            return True
+        time.sleep(0.5)
     return False
 
 
@@ -90,71 +249,75 @@ def demo_basic_operations(client: KVStoreClient):
     """Demonstrate basic KV operations"""
     print("\n=== Basic Operations Demo ===")
     
-    test_data = {
-        "user:1001": {"name": "Alice", "age": 25},
-        "user:1002": {"name": "Bob", "age": 30}, 
-        "user:1003": {"name": "Charlie", "age": 28},
-        "product:2001": {"name": "Laptop", "price": 999.99},
-        "product:2002": {"name": "Mouse", "price": 29.99},
-        "order:3001": {"user_id": 1001, "product_id": 2001, "quantity": 1}
-    }
-    
-    # Store data
-    print("Storing data...")
-    for key, value in test_data.items():
-        success = client.put(key, value)
-        print(f"  PUT {key}: {'✓' if success else '✗'}")
-        
-    time.sleep(2)
-    
-    # Retrieve data
-    print("\nRetrieving data...")
-    for key in test_data.keys():
-        value = client.get(key)
-        print(f"  GET {key}: {value}")
-        
-    # Delete some data
-    print("\nDeleting data...")
-    delete_keys = ["user:1002", "product:2002"]
-    for key in delete_keys:
-        success = client.delete(key)
-        print(f"  DELETE {key}: {'✓' if success else '✗'}")
+    # Requests for different keys are independent, so issue them concurrently
+    # (map() keeps results in key order for stable output)
+    with ThreadPoolExecutor(max_workers=DEMO_WORKERS) as executor:
+        # Store data
+        print("Storing data...")
+        results = executor.map(client.put_raw, TEST_PAYLOADS.keys(), TEST_PAYLOADS.values())
+        print_lines(f"  PUT {key}: {'✓' if success else '✗'}" for key, success in zip(TEST_PAYLOADS.keys(), results))
+            
+        time.sleep(2)
         
-    # Verify deletions
-    print("\nVerifying deletions...")
-    for key in delete_keys:
-        value = client.get(key)
-        print(f"  GET {key}: {value}")
+        # Retrieve data
+        print("\nRetrieving data...")
+        values = executor.map(client.get, TEST_DATA.keys())
+        print_lines(f"  GET {key}: {value}" for key, value in zip(TEST_DATA.keys(), values))
+            
+        # Delete some data
+        print("\nDeleting data...")
+        delete_keys = ["user:1002", "product:2002"]
+        results = executor.map(client.delete, delete_keys)
+        print_lines(f"  DELETE {key}: {'✓' if success else '✗'}" for key, success in zip(delete_keys, results))
+            
+        # Verify deletions
+        print("\nVerifying deletions...")
+        values = executor.map(client.get, delete_keys)
+        print_lines(f"  GET {key}: {value}" for key, value in zip(delete_keys, values))
+
+
+def fetch_distribution(gateway_address: str, keys: List[str]) -> Dict[str, Optional[str]]:
+    """Map each key to the ID of the node the gateway routes it to (one round trip)"""
+    response = post_json(f"http://{gateway_address}/nodes/lookup", {"keys": keys})
+    if response.status_code != 200:
+        return {key: None for key in keys}
+    mapping = json_loads(response.content)["mapping"]
+    return {key: node["node_id"] if node else None for key, node in mapping.items()}
+
 
+def print_lines(lines: Iterable[str]):
+    """Write a block of output lines with a single stdout write"""
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
 
-def demo_consistent_hashing(gateway_address: str):
+
+def format_ring_status(response: requests.Response, pretty: bool = False) -> str:
+    """Format a /ring/status response, re-serializing only when pretty output is requested"""
+    if pretty:
+        return json.dumps(json_loads(response.content), indent=2)
+    return response.text.strip()
+
+
+def demo_consistent_hashing(gateway_address: str, pretty: bool = False):
     """Demonstrate consistent hashing behavior"""
     print("\n=== Consistent Hashing Demo ===")
     
     # Show current ring status
     try:
-        response = requests.get(f"http://{gateway_address}/ring/status")
+        response = SESSION.get(f"http://{gateway_address}/ring/status")
         if response.status_code == 200:
-            ring_info = response.json()
-            print(f"Ring Status: {json.dumps(ring_info, indent=2)}")
+            print(f"Ring Status: {format_ring_status(response, pretty)}")
         
         # Show which node handles different keys
         test_keys = ["user:1001", "user:1002", "product:2001", "order:3001", "cache:abc", "session:xyz"]
         print("\nKey distribution:")
-        for key in test_keys:
-            response = requests.get(f"http://{gateway_address}/nodes/{key}")
-            if response.status_code == 200:
-                node_info = response.json()
-                node_id = node_info["node"]["node_id"]
-                print(f"  {key} -> {node_id}")
-            else:
-                print(f"  {key} -> No nodes available")
+        distribution = fetch_distribution(gateway_address, test_keys)
+        print_lines(f"  {key} -> {node_id or 'No nodes available'}" for key, node_id in distribution.items())
                 
     except Exception as e:
         print(f"Error querying ring: {e}")
 
 
-def demo_node_failure_recovery(manager: ProcessManager, gateway_address: str):
+def demo_node_failure_recovery(manager: ProcessManager, gateway_address: str, pretty: bool = False):
     """Demonstrate node failure and recovery"""
     print("\n=== Node Failure and Recovery Demo ===")
     
@@ -162,22 +325,29 @@ def demo_node_failure_recovery(manager: ProcessManager, gateway_address: str):
     
     # Store some test data
     test_keys = ["test:fail1", "test:fail2", "test:fail3"]
-    for key in test_keys:
-        client.put(key, f"value_{key}")
+    with ThreadPoolExecutor(max_workers=DEMO_WORKERS) as executor:
+        list(executor.map(client.put, test_keys, [f"value_{key}" for key in test_keys]))
     
     print("Stored test data")
     time.sleep(5)
     
     # Show initial distribution
     print("Initial key distribution:")
-    for key in test_keys:
-        try:
-            response = requests.get(f"http://{gateway_address}/nodes/{key}")
-            if response.status_code == 200:
-                node_id = response.json()["node"]["node_id"]
-                print(f"  {key} -> {node_id}")
-        except:
-            print(f"  {key} -> Error")
+    try:
+        before = fetch_distribution(gateway_address, test_keys)
+        print_lines(f"  {key} -> {node_id}" for key, node_id in before.items() if node_id)
+    except REQUEST_ERRORS:
+        before = None
+        print_lines(f"  {key} -> Error" for key in test_keys)
+    
+    # Snapshot ring membership so we can detect when the failure is noticed
+    status_url = f"http://{gateway_address}/ring/status"
+    ring_nodes_before = get_ring_nodes(status_url)
+    for _ in range(3):
+        if ring_nodes_before is not None:
+            break
+        time.sleep(0.5)
+        ring_nodes_before = get_ring_nodes(status_url)
     
     # Simulate node failure by stopping one KV store
     print("\nSimulating node failure (stopping one process)...")
@@ -185,38 +355,52 @@ def demo_node_failure_recovery(manager: ProcessManager, gateway_address: str):
         # Stop the last started process (likely a KV store)
         failed_process = manager.processes.pop()
         failed_process.terminate()
-        try:
-            failed_process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
+        failed_process.join(timeout=5)
+        if failed_process.is_alive():
             failed_process.kill()
     
-    # Wait for failure detection
-    print("Waiting for failure detection...")
-    time.sleep(35)  # Wait longer than heartbeat timeout
+    # Wait for failure detection (bounded by heartbeat timeout + health check interval)
+    # Without a baseline any successful poll would look like a change
+    if ring_nodes_before is None:
+        print("Ring status unavailable before the failure; skipping failure detection")
+    else:
+        print("Waiting for failure detection...")
+        if not wait_for_ring_change(status_url, ring_nodes_before, timeout=45):
+            print("Ring membership did not change before timeout")
     
     # Show ring status after failure
     try:
-        response = requests.get(f"http://{gateway_address}/ring/status")
+        response = SESSION.get(status_url)
         if response.status_code == 200:
-            ring_info = response.json()
-            print(f"Ring Status after failure: {json.dumps(ring_info, indent=2)}")
+            print(f"Ring Status after failure: {format_ring_status(response, pretty)}")
     except Exception as e:
         print(f"Error querying ring: {e}")
     
-    # Show redistribution
+    # Show redistribution, reusing the pre-failure lookup to report only moved keys
     print("Key distribution after failure:")
-    for key in test_keys:
-        try:
-            response = requests.get(f"http://{gateway_address}/nodes/{key}")
-            if response.status_code == 200:
-                node_id = response.json()["node"]["node_id"]
-                print(f"  {key} -> {node_id}")
-        except:
-            print(f"  {key} -> Error")
+    try:
+        after = fetch_distribution(gateway_address, test_keys)
+    except REQUEST_ERRORS:
+        print_lines(f"  {key} -> Error" for key in test_keys)
+        return
+    if before is None:
+        print_lines(f"  {key} -> {node_id}" for key, node_id in after.items() if node_id)
+        return
+    moved = [key for key in test_keys if before.get(key) != after.get(key)]
+    if moved:
+        print_lines(f"  {key}: {before.get(key)} -> {after.get(key)}" for key in moved)
+    else:
+        print("  No keys moved")
 
 
 def main():
     """Main demo function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Consistent Hashing System Demo')
+    parser.add_argument('--pretty', action='store_true', help='Pretty-print ring status JSON')
+    args = parser.parse_args()
+    
     manager = ProcessManager()
     
     # Signal handler for clean shutdown
@@ -233,45 +417,52 @@ def main():
         
         # Start gateway services
         gateway_peers = ["localhost:8001", "localhost:8002", "localhost:8003"]
-        manager.start_gateway("gateway-1", 8000, 8001, gateway_peers[1:])
-        manager.start_gateway("gateway-2", 8001, 8002, [gateway_peers[0], gateway_peers[2]])
-        manager.start_gateway("gateway-3", 8002, 8003, gateway_peers[:2])
+        gateways = [
+            manager.start_gateway("gateway-1", 8000, 8001, gateway_peers[1:]),
+            manager.start_gateway("gateway-2", 8001, 8002, [gateway_peers[0], gateway_peers[2]]),
+            manager.start_gateway("gateway-3", 8002, 8003, gateway_peers[:2]),
+        ]
         
         # Wait for gateways to start
         print("Waiting for gateways to start...")
-        time.sleep(5)
-        
-        # Check if gateways are running
-        for i, port in enumerate([8000, 8001, 8002]):
-            if wait_for_service(f"http://localhost:{port}/ring/status", 10):
+        gateway_urls = [f"http://localhost:{port}/ring/status" for port in [8000, 8001, 8002]]
+        for i, ready in enumerate(wait_for_services(gateway_urls, 15, gateways)):
+            if ready:
                 print(f"Gateway {i+1} is ready")
             else:
-                print(f"Gateway {i+1} failed to start")
+                print(f"Gateway {i+1} failed to start (see {manager.log_path(f'gateway-{i+1}')})")
         
         # Start KV store services
         gateway_address = "localhost:8000"  # Use first gateway
-        manager.start_kvstore("kvstore-A", 8080, gateway_address)
-        manager.start_kvstore("kvstore-B", 8081, gateway_address) 
-        manager.start_kvstore("kvstore-C", 8082, gateway_address)
+        kvstores = [
+            manager.start_kvstore("kvstore-A", 8080, gateway_address),
+            manager.start_kvstore("kvstore-B", 8081, gateway_address),
+            manager.start_kvstore("kvstore-C", 8082, gateway_address),
+        ]
         
-        # Wait for KV stores to register
+        # Wait for KV stores to come up (they register with the gateway on startup)
         print("Waiting for KV stores to register...")
-        time.sleep(15)
+        kvstore_urls = [f"http://localhost:{port}/health" for port in [8080, 8081, 8082]]
+        for node_id, ready in zip(["kvstore-A", "kvstore-B", "kvstore-C"], wait_for_services(kvstore_urls, 15, kvstores)):
+            if not ready:
+                print(f"KV store {node_id} failed to start (see {manager.log_path(node_id)})")
         
         # Create client
         client = KVStoreClient(gateway_address)
         
         # Run demos
         demo_basic_operations(client)
-        demo_consistent_hashing(gateway_address)
-        demo_node_failure_recovery(manager, gateway_address)
+        demo_consistent_hashing(gateway_address, args.pretty)
+        demo_node_failure_recovery(manager, gateway_address, args.pretty)
         
         print("\n=== Demo completed ===")
         print("Press Ctrl+C to exit")
         
-        # Keep running until interrupted
-        while True:
-            time.sleep(1)
+        # Keep running until interrupted; the signal handler exits for us
+        if hasattr(signal, "pause"):
+            signal.pause()
+        else:  # Windows has no signal.pause()
+            threading.Event().wait()
             
     except Exception as e:
         print(f"Demo error: {e}")
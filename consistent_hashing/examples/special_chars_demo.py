@@ -6,9 +6,19 @@ This script shows how to use the new POST endpoints for handling keys
 with special characters that would cause issues in URL paths.
 """
 
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, List
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    from json import dumps as json_dumps, loads as json_loads
 
 # Add the parent directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,29 +26,110 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from storage.kvstore.kvstore_service import KVStoreClient
 
 
+# Shared HTTP session so all demo calls reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0))
+atexit.register(SESSION.close)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Example special keys that would cause URL issues
+SPECIAL_KEYS = [
+    "key/with/slashes",
+    "key with spaces",
+    "key@with#symbols$%",
+    "key:with:colons",
+    "key?with&query=params",
+    "key[with]brackets",
+    "key{with}braces",
+    "特殊字符键",  # Unicode characters
+    "clé_spéciale",  # Accented characters
+    "🔑_emoji_key"  # Emoji in key
+]
+
+
+SUMMARY = """
+📋 Summary:
+----------
+✅ POST /put         - Always works (key in body)
+✅ POST /get         - Works with special chars (key in body)
+✅ GET /get/<key>    - Works with simple keys only
+✅ POST /delete      - Works with special chars (key in body)
+✅ POST /bulk        - Batches put/get/delete ops in one request
+✅ DELETE /delete/<key> - Works with simple keys only
+
+💡 Use POST methods for keys with special characters!
+💡 Client library automatically chooses the right method!
+"""
+
+
+def post_json(url: str, payload: Any, timeout: float = 5) -> requests.Response:
+    """POST a JSON body encoded with the fast serializer"""
+    return SESSION.post(url, data=json_dumps(payload), headers=JSON_HEADERS, timeout=timeout)
+
+
+def exercise_special_key(key: str, kvstore_url: str) -> List[str]:
+    """Run the put/get/delete walkthrough for one key and return its output lines"""
+    value = f"value_for_{key.replace(' ', '_').replace('/', '_')}"
+    lines = [f"\n📝 Testing key: '{key}'"]
+    
+    # Store and read back in a single /bulk round trip (key travels in the body)
+    lines.append("  1. Storing value and retrieving it with one bulk POST...")
+    try:
+        response = post_json(f"{kvstore_url}/bulk", {"ops": [
+            {"op": "put", "key": key, "value": value},
+            {"op": "get", "key": key}
+        ]})
+        if response.status_code != 200:
+            lines.append(f"     ❌ Bulk request failed: {response.status_code}")
+            return lines
+        put_result, get_result = json_loads(response.content)["results"]
+        if "error" in put_result:
+            lines.append(f"     ❌ Store failed: {put_result['error']}")
+            return lines
+        lines.append(f"     ✅ Stored successfully")
+        if "error" in get_result:
+            lines.append(f"     ❌ Retrieve failed: {get_result['error']}")
+        else:
+            lines.append(f"     ✅ Retrieved: '{get_result['value']}'")
+    except Exception as e:
+        lines.append(f"     ❌ Bulk request error: {e}")
+        return lines
+    
+    # Try old GET method (will fail for special chars)
+    lines.append("  2. Comparing with GET method...")
+    try:
+        response = SESSION.get(f"{kvstore_url}/get/{key}", timeout=5)
+        if response.status_code == 200:
+            lines.append(f"     ✅ GET method also works")
+        else:
+            lines.append(f"     ⚠️  GET method failed: {response.status_code} (expected for special chars)")
+    except Exception as e:
+        lines.append(f"     ⚠️  GET method error: {e} (expected for special chars)")
+    
+    # Delete using POST method
+    lines.append("  3. Deleting with POST method...")
+    try:
+        response = post_json(f"{kvstore_url}/delete", {"key": key})
+        if response.status_code == 200:
+            lines.append(f"     ✅ Deleted successfully")
+        else:
+            lines.append(f"     ❌ Delete failed: {response.status_code}")
+    except Exception as e:
+        lines.append(f"     ❌ Delete error: {e}")
+    
+    return lines
+
+
 def demo_special_characters():
     """Demonstrate handling of keys with special characters"""
     
     print("🔍 Special Character Handling Demo")
     print("=" * 50)
     
-    # Example special keys that would cause URL issues
-    special_keys = [
-        "key/with/slashes",
-        "key with spaces", 
-        "key@with#symbols$%",
-        "key:with:colons",
-        "key?with&query=params",
-        "key[with]brackets",
-        "key{with}braces",
-        "特殊字符键",  # Unicode characters
-        "clé_spéciale",  # Accented characters
-        "🔑_emoji_key"  # Emoji in key
-    ]
-    
     print("\n📦 Keys with Special Characters:")
-    for i, key in enumerate(special_keys, 1):
-        print(f"  {i:2d}. '{key}'")
+    print("\n".join(f"  {i:2d}. '{key}'" for i, key in enumerate(SPECIAL_KEYS, 1)))
     
     # Direct KV Store API Examples
     print("\n🚀 Direct API Usage Examples:")
@@ -46,69 +137,13 @@ def demo_special_characters():
     
     kvstore_url = "http://localhost:8080"  # Assuming KV store is running
     
-    for key in special_keys[:3]:  # Test first 3 keys
-        value = f"value_for_{key.replace(' ', '_').replace('/', '_')}"
-        
-        print(f"\n📝 Testing key: '{key}'")
-        
-        # Store using PUT (always uses POST body)
-        print("  1. Storing value...")
-        try:
-            response = requests.post(
-                f"{kvstore_url}/put",
-                json={"key": key, "value": value},
-                timeout=5
-            )
-            if response.status_code == 200:
-                print(f"     ✅ Stored successfully")
-            else:
-                print(f"     ❌ Store failed: {response.status_code}")
-                continue
-        except Exception as e:
-            print(f"     ❌ Store error: {e}")
-            continue
-        
-        # Retrieve using POST method (handles special chars)
-        print("  2. Retrieving with POST method...")
-        try:
-            response = requests.post(
-                f"{kvstore_url}/get",
-                json={"key": key},
-                timeout=5
-            )
-            if response.status_code == 200:
-                data = response.json()
-                print(f"     ✅ Retrieved: '{data['value']}'")
-            else:
-                print(f"     ❌ Retrieve failed: {response.status_code}")
-        except Exception as e:
-            print(f"     ❌ Retrieve error: {e}")
-        
-        # Try old GET method (will fail for special chars)
-        print("  3. Comparing with GET method...")
-        try:
-            response = requests.get(f"{kvstore_url}/get/{key}", timeout=5)
-            if response.status_code == 200:
-                print(f"     ✅ GET method also works")
-            else:
-                print(f"     ⚠️  GET method failed: {response.status_code} (expected for special chars)")
-        except Exception as e:
-            print(f"     ⚠️  GET method error: {e} (expected for special chars)")
-        
-        # Delete using POST method
-        print("  4. Deleting with POST method...")
-        try:
-            response = requests.post(
-                f"{kvstore_url}/delete",
-                json={"key": key},
-                timeout=5
-            )
-            if response.status_code == 200:
-                print(f"     ✅ Deleted successfully")
-            else:
-                print(f"     ❌ Delete failed: {response.status_code}")
-        except Exception as e:
-            print(f"     ❌ Delete error: {e}")
+    # Each key's walkthrough is independent, so run them concurrently and
+    # print each key's output as a block to keep it readable
+    test_keys = SPECIAL_KEYS[:3]  # Test first 3 keys
+    with ThreadPoolExecutor(max_workers=len(test_keys)) as executor:
+        walkthrough = partial(exercise_special_key, kvstore_url=kvstore_url)
+        for lines in executor.map(walkthrough, test_keys):
+            print("\n".join(lines))
     
     print("\n🧠 Client Library Usage:")
     print("-" * 25)
@@ -150,15 +185,7 @@ def demo_special_characters():
         print(f"  ⚠️  Client library demo skipped: {e}")
         print("     (Gateway might not be running)")
     
-    print("\n📋 Summary:")
-    print("-" * 10)
-    print("✅ POST /put         - Always works (key in body)")
-    print("✅ POST /get         - Works with special chars (key in body)")
-    print("✅ GET /get/<key>    - Works with simple keys only")
-    print("✅ POST /delete      - Works with special chars (key in body)")
-    print("✅ DELETE /delete/<key> - Works with simple keys only")
-    print("\n💡 Use POST methods for keys with special characters!")
-    print("💡 Client library automatically chooses the right method!")
+    sys.stdout.write(SUMMARY)
 
 
 def test_url_encoding_issues():
@@ -175,12 +202,14 @@ def test_url_encoding_issues():
         ("key?query=param", "key%3Fquery%3Dparam")
     ]
     
+    lines = []
     for original, encoded in problematic_keys:
-        print(f"\nKey: '{original}'")
-        print(f"  URL encoded: '{encoded}'")
-        print(f"  GET /get/{original} ← Will likely fail")
-        print(f"  GET /get/{encoded} ← Might work but ugly")
-        print(f"  POST /get + body    ← Always works! ✅")
+        lines.append(f"\nKey: '{original}'")
+        lines.append(f"  URL encoded: '{encoded}'")
+        lines.append(f"  GET /get/{original} ← Will likely fail")
+        lines.append(f"  GET /get/{encoded} ← Might work but ugly")
+        lines.append(f"  POST /get + body    ← Always works! ✅")
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
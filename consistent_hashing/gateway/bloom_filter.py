@@ -0,0 +1,66 @@
+"""
+Rotating Bloom Filter for Gossip Deduplication
+
+A fixed-memory filter that remembers recently seen message IDs so the
+gateway can drop duplicate gossip without keeping every ID forever.
+"""
+
+import hashlib
+import math
+from typing import List, Union
+
+
+class RotatingBloomFilter:
+    """Bloom filter with two generations that rotate once the current one is full.
+
+    Memory stays constant regardless of how many IDs are added: when the
+    current generation reaches its capacity it becomes the previous one and
+    the oldest IDs are forgotten. Lookups may return false positives at
+    roughly ``error_rate``, but never false negatives for IDs still retained.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        # Optimal bit count and hash count for the requested false positive rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+
+        self.current = bytearray((self.num_bits + 7) // 8)
+        self.previous = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: Union[str, bytes]) -> List[int]:
+        """Derive bit positions from one digest using double hashing"""
+        if isinstance(item, str):
+            item = item.encode()
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: List[int]) -> bool:
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        positions = self._positions(item)
+        return self._test(self.current, positions) or self._test(self.previous, positions)
+
+    def add(self, item: Union[str, bytes]) -> bool:
+        """Add an item; returns True if it was (probably) already present"""
+        positions = self._positions(item)
+        if self._test(self.current, positions) or self._test(self.previous, positions):
+            return True
+
+        if self.count >= self.capacity:
+            # Current generation is full - retire it and start a fresh one
+            self.previous = self.current
+            self.current = bytearray(len(self.previous))
+            self.count = 0
+
+        for pos in positions:
+            self.current[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+        return False
@@ -7,34 +7,127 @@ with other gateway instances.
 """
 
 import asyncio
+import functools
+import itertools
+from collections import Counter
 import json
 import logging
+import os
+import random
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 import raftos
-from flask import Flask, request, jsonify
-from hash_ring import HashRing
+from flask import Flask, Response, request
+try:
+    from .maglev_ring import MaglevRing
+    from .bloom_filter import RotatingBloomFilter
+    from .rwlock import ReadWriteLock
+except ImportError:
+    from maglev_ring import MaglevRing
+    from bloom_filter import RotatingBloomFilter
+    from rwlock import ReadWriteLock
+import queue
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    from json import dumps as json_dumps, loads as json_loads
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; gossip between gateways falls back to JSON
+    msgpack = None
+
+try:
+    from waitress import create_server
+except ImportError:  # waitress is optional; fall back to Flask's dev server
+    create_server = None
+
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+MSGPACK_MIMETYPE = "application/msgpack"
+GOSSIP_HEADERS = {"Content-Type": MSGPACK_MIMETYPE} if msgpack is not None else JSON_HEADERS
+
+# Gossip message IDs are "<sender>:<boot id>:<sequence>"; the random boot id
+# keeps them unique across restarts without a uuid4() call per message
+_BOOT_ID = uuid.uuid4().hex[:8]
+_message_seq = itertools.count()
+
+# Node statuses are small ints internally; the API reports them by name
+STATUS_ACTIVE, STATUS_INACTIVE, STATUS_DEAD = 0, 1, 2
+STATUS_NAMES = ("active", "inactive", "dead")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """Build a JSON response without going through Flask's stdlib-based jsonify"""
+    return Response(json_dumps(obj), status=status, mimetype="application/json")
+
+
+def parse_json_body():
+    """Parse the current request body as JSON (None if the body is empty)"""
+    body = request.get_data(cache=False)
+    return json_loads(body) if body else None
+
+
+def encode_gossip(payload) -> bytes:
+    """Encode a gateway-to-gateway gossip body (msgpack when available)"""
+    if msgpack is not None:
+        return msgpack.packb(payload)
+    return json_dumps(payload)
+
+
+def parse_gossip_body():
+    """Parse the current gossip request body according to its content type"""
+    if request.mimetype == MSGPACK_MIMETYPE:
+        if msgpack is None:
+            raise ValueError("msgpack gossip is not supported by this gateway")
+        return msgpack.unpackb(request.get_data(cache=False))
+    return parse_json_body()
+
+
+def prioritize_current_thread(cpu: Optional[int] = None, fifo_priority: int = 10):
+    """Pin the calling thread to one CPU and give it real-time priority.
+
+    Used for the health-check thread so its wakeups are not delayed by busy
+    request workers. Both steps are best effort: they need Linux, and
+    SCHED_FIFO additionally needs CAP_SYS_NICE.
+    """
+    try:
+        if cpu is None:
+            cpu = max(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpu})
+    except (AttributeError, OSError) as e:
+        logger.debug("could not pin thread to CPU %s: %s", cpu, e)
+        
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+    except (AttributeError, OSError) as e:
+        logger.debug("could not set SCHED_FIFO: %s", e)
+
 
 class NodeInfo:
     """Information about a KV store node"""
+    __slots__ = ("node_id", "address", "port", "last_heartbeat", "status")
+    
     def __init__(self, node_id: str, address: str, port: int):
         self.node_id = node_id
         self.address = address
         self.port = port
         self.last_heartbeat = time.time()
-        self.status = "active"  # active, inactive, dead
+        self.status = STATUS_ACTIVE  # One of the STATUS_* codes
         
     def to_dict(self):
         return {
@@ -42,21 +135,23 @@ class NodeInfo:
             "address": self.address,
             "port": self.port,
             "last_heartbeat": self.last_heartbeat,
-            "status": self.status
+            "status": STATUS_NAMES[self.status]
         }
         
     @classmethod
     def from_dict(cls, data):
         node = cls(data["node_id"], data["address"], data["port"])
         node.last_heartbeat = data["last_heartbeat"]
-        node.status = data["status"]
+        node.status = STATUS_CODES[data["status"]]
         return node
 
 
 class GossipMessage:
     """Message format for gossip protocol"""
+    __slots__ = ("message_id", "message_type", "sender_id", "data", "timestamp")
+    
     def __init__(self, message_type: str, sender_id: str, data: dict):
-        self.message_id = str(uuid.uuid4())
+        self.message_id = f"{sender_id}:{_BOOT_ID}:{next(_message_seq)}"
         self.message_type = message_type  # HEARTBEAT, NODE_UPDATE, RING_SYNC
         self.sender_id = sender_id
         self.data = data
@@ -73,8 +168,13 @@ class GossipMessage:
         
     @classmethod
     def from_dict(cls, data):
-        msg = cls(data["message_type"], data["sender_id"], data["data"])
+        # Received messages keep the sender's ID and timestamp, so skip
+        # __init__ rather than generate values only to overwrite them
+        msg = cls.__new__(cls)
         msg.message_id = data["message_id"]
+        msg.message_type = data["message_type"]
+        msg.sender_id = data["sender_id"]
+        msg.data = data["data"]
         msg.timestamp = data["timestamp"]
         return msg
 
@@ -89,21 +189,44 @@ class GatewayService:
         self.raft_port = raft_port
         self.peer_gateways = peer_gateways or []
         
-        # Hash ring for consistent hashing
-        self.hash_ring = HashRing()
+        # Maglev lookup table for consistent hashing (O(1) key lookups)
+        self.hash_ring = MaglevRing()
+        # Recently looked-up keys map straight to their node; the cache is
+        # cleared whenever ring membership changes
+        self.lookup_node = functools.lru_cache(maxsize=65536)(
+            lambda key: self.hash_ring.get_node(key))
         
         # Node management
         self.nodes: Dict[str, NodeInfo] = {}
-        self.node_lock = threading.RLock()
+        self.node_lock = ReadWriteLock()  # Read-only routes share it
+        # Serializes ring membership changes, whose new lookup table is built
+        # before node_lock is taken so readers only wait for the swap
+        self.ring_update_lock = threading.Lock()
+        # Encoded /nodes response tagged with the nodes_version it was built
+        # from; any change to the node table bumps the version
+        self.nodes_json_cache: Optional[Tuple[int, bytes]] = None
+        self.nodes_version = 0
+        # Active node count, tagged with the nodes_version it was counted at
+        self.active_count_cache: Tuple[int, int] = (-1, 0)
         
         # Gossip protocol
-        self.gossip_messages: Set[str] = set()  # Track seen message IDs
+        # Recently seen message IDs, in fixed memory (old IDs rotate out)
+        self.gossip_messages = RotatingBloomFilter(capacity=100000, error_rate=0.001)
         self.gossip_lock = threading.RLock()
+        # Outgoing messages wait here briefly so they can be sent as one batch
+        self.gossip_outbox: "queue.Queue[GossipMessage]" = queue.Queue()
+        self.gossip_bytes_sent = 0  # Payload bytes delivered to peers
+        self.gossip_received = Counter()  # Accepted gossip messages by type
         
         # Configuration
         self.heartbeat_timeout = 30  # seconds
         self.gossip_interval = 5     # seconds
         self.health_check_interval = 10  # seconds
+        self.gossip_batch_window = 0.5   # seconds to coalesce outgoing gossip
+        self.gossip_batch_size = 100     # max messages per gossip POST
+        self.gossip_fanout = 3           # peers each batch is pushed to; digests reach the rest
+        self.server_threads = 16  # HTTP worker threads
+        self.raft_batch_window = 0.1  # seconds to coalesce node additions
         
         # Flask app for HTTP API
         self.app = Flask(__name__)
@@ -113,6 +236,20 @@ class GatewayService:
         self.executor = ThreadPoolExecutor(max_workers=10)
         self.running = False
         
+        # New nodes waiting to be added in the next Raft batch, by node_id
+        self.pending_adds: Dict[str, dict] = {}
+        self.pending_adds_lock = threading.Lock()
+        self.server = None
+        
+        # Gossip sends run on their own pool sized to the peer count, reusing
+        # keep-alive connections from one shared session
+        gossip_workers = max(1, len(self.peer_gateways))
+        self.gossip_executor = ThreadPoolExecutor(max_workers=gossip_workers,
+                                                  thread_name_prefix="gossip")
+        self.gossip_session = requests.Session()
+        self.gossip_session.mount("http://", HTTPAdapter(
+            pool_connections=gossip_workers, pool_maxsize=gossip_workers))
+        
         # Initialize Raft
         self.setup_raft()
         
@@ -134,6 +271,12 @@ class GatewayService:
                 logger.info(f"Raft: Adding node {node_data}")
                 return self._add_node_to_ring(node_data)
                 
+            @raftos.command
+            def add_nodes_command(nodes_list):
+                """Raft command to add a batch of nodes in one log entry"""
+                logger.info(f"Raft: Adding {len(nodes_list)} nodes")
+                return self._add_nodes_to_ring(nodes_list)
+                
             @raftos.command  
             def remove_node_command(node_id):
                 """Raft command to remove a node from the ring"""
@@ -141,6 +284,7 @@ class GatewayService:
                 return self._remove_node_from_ring(node_id)
                 
             self.add_node_command = add_node_command
+            self.add_nodes_command = add_nodes_command
             self.remove_node_command = remove_node_command
             
         except Exception as e:
@@ -148,36 +292,76 @@ class GatewayService:
             
     def _add_node_to_ring(self, node_data: dict) -> bool:
         """Internal method to add node to hash ring"""
+        return self._add_nodes_to_ring([node_data])
+    
+    def _add_nodes_to_ring(self, nodes_list: List[dict]) -> bool:
+        """Internal method to add a batch of nodes with one table rebuild"""
         try:
-            with self.node_lock:
-                node_id = node_data["node_id"]
-                if node_id not in self.nodes:
-                    node = NodeInfo.from_dict(node_data)
-                    self.nodes[node_id] = node
-                    
-                # Update hash ring
-                self.hash_ring.add_node(node_id)
-                logger.info(f"Added node {node_id} to hash ring")
-                return True
+            node_ids = [node_data["node_id"] for node_data in nodes_list]
+            with self.ring_update_lock:
+                state = self.hash_ring.prepare(add=node_ids)
+                with self.node_lock:
+                    for node_data in nodes_list:
+                        node_id = node_data["node_id"]
+                        if node_id not in self.nodes:
+                            self.nodes[node_id] = NodeInfo.from_dict(node_data)
+                            self.nodes_version += 1
+                        
+                    # Update hash ring
+                    self.hash_ring.install(state)
+                    self.lookup_node.cache_clear()
+            logger.info("Added nodes %s to hash ring", ", ".join(node_ids))
+            return True
         except Exception as e:
-            logger.error(f"Failed to add node to ring: {e}")
+            logger.error(f"Failed to add nodes to ring: {e}")
             return False
             
     def _remove_node_from_ring(self, node_id: str) -> bool:
         """Internal method to remove node from hash ring"""
         try:
-            with self.node_lock:
-                if node_id in self.nodes:
-                    del self.nodes[node_id]
-                    
-                # Update hash ring
-                self.hash_ring.remove_node(node_id)
-                logger.info(f"Removed node {node_id} from hash ring")
-                return True
+            with self.ring_update_lock:
+                state = self.hash_ring.prepare(remove=(node_id,))
+                with self.node_lock:
+                    if node_id in self.nodes:
+                        del self.nodes[node_id]
+                        self.nodes_version += 1
+                        
+                    # Update hash ring
+                    self.hash_ring.install(state)
+                    self.lookup_node.cache_clear()
+            logger.info("Removed node %s from hash ring", node_id)
+            return True
         except Exception as e:
             logger.error(f"Failed to remove node from ring: {e}")
             return False
     
+    def _record_heartbeat(self, node: NodeInfo, timestamp: float):
+        """Refresh a node's heartbeat.
+        
+        Needs no lock: the attribute stores are atomic, and the version is
+        bumped after them so a /nodes body built concurrently is discarded.
+        """
+        # Only a status change or a new whole second invalidates the cached
+        # /nodes body, so a burst of heartbeats doesn't rebuild it every time
+        changed = node.status != STATUS_ACTIVE or int(timestamp) != int(node.last_heartbeat)
+        node.last_heartbeat = timestamp
+        node.status = STATUS_ACTIVE
+        if changed:
+            self.nodes_version += 1
+    
+    def _count_active_nodes(self) -> int:
+        """Number of active nodes; recounted only after the node table changes.
+        
+        Every status change bumps nodes_version, so the cached count is exact
+        for the version it is tagged with. Callers hold the read lock.
+        """
+        version, count = self.active_count_cache
+        if version != self.nodes_version:
+            version = self.nodes_version
+            count = sum(1 for n in self.nodes.values() if n.status == STATUS_ACTIVE)
+            self.active_count_cache = (version, count)
+        return count
+    
     def setup_routes(self):
         """Setup Flask routes for the gateway API"""
         
@@ -185,104 +369,215 @@ class GatewayService:
         def receive_heartbeat():
             """Receive heartbeat from KV store nodes"""
             try:
-                data = request.get_json()
+                data = parse_json_body()
                 node_id = data.get('node_id')
                 address = data.get('address')
                 port = data.get('port', 8080)
                 
-                if not node_id or not address:
-                    return jsonify({"error": "Missing node_id or address"}), 400
+                # Known nodes may send compact heartbeats without their
+                # address, which never changes after registration
+                node = self.nodes.get(node_id) if node_id else None
+                if not node_id or (node is None and not address):
+                    return json_response({"error": "Missing node_id or address"}, 400)
                 
-                # Update or create node info
-                with self.node_lock:
-                    if node_id not in self.nodes:
-                        # New node - use Raft to add it
-                        node_data = {
-                            "node_id": node_id,
-                            "address": address, 
-                            "port": port,
-                            "last_heartbeat": time.time(),
-                            "status": "active"
-                        }
-                        self.executor.submit(self._raft_add_node, node_data)
-                    else:
-                        # Existing node - update heartbeat
-                        self.nodes[node_id].last_heartbeat = time.time()
-                        self.nodes[node_id].status = "active"
+                # Existing node - refresh its heartbeat without taking the lock
+                if node is not None:
+                    self._record_heartbeat(node, time.time())
+                    if not address:
+                        address, port = node.address, node.port
+                else:
+                    with self.node_lock:
+                        if node_id not in self.nodes:
+                            # New node - use Raft to add it
+                            node_data = {
+                                "node_id": node_id,
+                                "address": address, 
+                                "port": port,
+                                "last_heartbeat": time.time(),
+                                "status": "active"
+                            }
+                            self._queue_raft_add(node_data)
+                        else:
+                            # Registered by a concurrent heartbeat
+                            self._record_heartbeat(self.nodes[node_id], time.time())
                 
                 # Gossip heartbeat to other gateways
                 self._gossip_heartbeat(node_id, address, port)
                 
-                return jsonify({"status": "heartbeat_received"}), 200
+                return json_response({"status": "heartbeat_received"}, 200)
                 
             except Exception as e:
                 logger.error(f"Error processing heartbeat: {e}")
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}, 500)
         
         @self.app.route('/nodes', methods=['GET'])
         def get_nodes():
-            """Get all nodes in the ring"""
-            with self.node_lock:
+            """Get all nodes in the ring.
+            
+            Served from a cached body: membership and status changes show up
+            immediately, but last_heartbeat may lag by up to one second since
+            heartbeats within the same second don't invalidate the cache.
+            
+            Large tables can be fetched in pages with ?limit=N&offset=M; paged
+            responses are built directly and also report the total node count.
+            """
+            if 'limit' in request.args or 'offset' in request.args:
+                try:
+                    limit = int(request.args.get('limit', 100))
+                    offset = int(request.args.get('offset', 0))
+                except ValueError:
+                    return json_response({"error": "limit and offset must be integers"}, 400)
+                if limit < 0 or offset < 0:
+                    return json_response({"error": "limit and offset must be non-negative"}, 400)
+                    
+                with self.node_lock.read():
+                    page = itertools.islice(self.nodes.items(), offset, offset + limit)
+                    nodes = {nid: node.to_dict() for nid, node in page}
+                    total = len(self.nodes)
+                return json_response({"nodes": nodes, "total": total}, 200)
+                
+            # The cache is published as one immutable (version, body) tuple and
+            # writers bump the version after mutating, so a hit needs no lock
+            cached = self.nodes_json_cache
+            if cached is not None and cached[0] == self.nodes_version:
+                return Response(cached[1], status=200, mimetype="application/json")
+                
+            with self.node_lock.read():
+                # Tag with the version read before building, so a change
+                # made meanwhile forces another rebuild next time
+                version = self.nodes_version
                 nodes = {nid: node.to_dict() for nid, node in self.nodes.items()}
-            return jsonify({"nodes": nodes}), 200
+                body = json_dumps({"nodes": nodes})
+                self.nodes_json_cache = (version, body)
+            return Response(body, status=200, mimetype="application/json")
             
         @self.app.route('/nodes/<key>', methods=['GET'])
         def get_node_for_key(key):
             """Get the node responsible for a given key"""
             try:
                 if not self.hash_ring.nodes:
-                    return jsonify({"error": "No nodes in ring"}), 404
+                    return json_response({"error": "No nodes in ring"}, 404)
                     
-                node_id = self.hash_ring.get_node(key)
-                with self.node_lock:
+                with self.node_lock.read():
+                    # Looked up under the lock so a concurrent ring change
+                    # can't leave a stale entry in the cache
+                    node_id = self.lookup_node(key)
                     node_info = self.nodes.get(node_id)
                     if node_info:
-                        return jsonify({
+                        return json_response({
                             "key": key,
                             "node": node_info.to_dict()
-                        }), 200
+                        }, 200)
                     else:
-                        return jsonify({"error": "Node not found"}), 404
+                        return json_response({"error": "Node not found"}, 404)
                         
             except Exception as e:
                 logger.error(f"Error getting node for key: {e}")
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}, 500)
+                
+        @self.app.route('/nodes/lookup', methods=['POST'])
+        def get_nodes_for_keys():
+            """Get the nodes responsible for a batch of keys in one round trip"""
+            try:
+                data = parse_json_body()
+                keys = data.get('keys') if data else None
+                
+                if not isinstance(keys, list):
+                    return json_response({"error": "Missing keys list"}, 400)
+                    
+                if not self.hash_ring.nodes:
+                    return json_response({"error": "No nodes in ring"}, 404)
+                    
+                mapping = {}
+                with self.node_lock.read():
+                    for key in keys:
+                        node_info = self.nodes.get(self.lookup_node(key))
+                        mapping[key] = node_info.to_dict() if node_info else None
+                        
+                return json_response({"mapping": mapping}, 200)
+                
+            except Exception as e:
+                logger.error(f"Error getting nodes for keys: {e}")
+                return json_response({"error": str(e)}, 500)
                 
         @self.app.route('/ring/status', methods=['GET'])
         def get_ring_status():
             """Get hash ring status and statistics"""
-            with self.node_lock:
-                return jsonify({
+            with self.gossip_lock:
+                gossip_received = dict(self.gossip_received)
+            with self.node_lock.read():
+                return json_response({
                     "gateway_id": self.gateway_id,
                     "total_nodes": len(self.nodes),
-                    "active_nodes": len([n for n in self.nodes.values() if n.status == "active"]),
+                    "active_nodes": self._count_active_nodes(),
                     "ring_nodes": list(self.hash_ring.nodes),
-                    "peer_gateways": self.peer_gateways
-                }), 200
+                    "peer_gateways": self.peer_gateways,
+                    "gossip_bytes_sent": self.gossip_bytes_sent,
+                    "gossip_received": gossip_received,
+                    "table_size": self.hash_ring.table_size  # Lets clients mirror the ring locally
+                }, 200)
                 
+        @self.app.route('/digest', methods=['GET'])
+        def get_digest():
+            """Compact {node_id: heartbeat second} summary for anti-entropy sync"""
+            with self.node_lock.read():
+                digest = {node_id: int(node.last_heartbeat) for node_id, node in self.nodes.items()}
+            return json_response(digest, 200)
+            
+        @self.app.route('/digest/entries', methods=['POST'])
+        def get_digest_entries():
+            """Full node entries for the node IDs a peer found stale"""
+            data = parse_json_body()
+            node_ids = data.get('node_ids') if data else None
+            if not isinstance(node_ids, list):
+                return json_response({"error": "Missing node_ids list"}, 400)
+                
+            with self.node_lock.read():
+                nodes = [self.nodes[node_id].to_dict() for node_id in node_ids if node_id in self.nodes]
+            return json_response({"nodes": nodes}, 200)
+            
         @self.app.route('/gossip', methods=['POST'])
         def receive_gossip():
             """Receive gossip messages from other gateways"""
             try:
-                data = request.get_json()
-                message = GossipMessage.from_dict(data)
+                data = parse_gossip_body()
                 
-                # Process gossip message
-                self._process_gossip_message(message)
+                # Peers send batches; a bare message is still accepted
+                for message_data in data.get("batch", [data]):
+                    self._process_gossip_message(GossipMessage.from_dict(message_data))
                 
-                return jsonify({"status": "gossip_received"}), 200
+                return json_response({"status": "gossip_received"}, 200)
                 
             except Exception as e:
                 logger.error(f"Error processing gossip: {e}")
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}, 500)
     
-    def _raft_add_node(self, node_data: dict):
-        """Use Raft to add a node (async operation)"""
+    def _queue_raft_add(self, node_data: dict):
+        """Queue a new node for the next batched Raft add"""
+        with self.pending_adds_lock:
+            first = not self.pending_adds
+            # Repeated heartbeats from the same new node collapse to one entry
+            self.pending_adds[node_data["node_id"]] = node_data
+        if first:
+            timer = threading.Timer(self.raft_batch_window, self._flush_raft_adds)
+            timer.daemon = True
+            timer.start()
+            
+    def _flush_raft_adds(self):
+        """Submit all queued node additions as a single Raft command"""
+        with self.pending_adds_lock:
+            nodes_list = list(self.pending_adds.values())
+            self.pending_adds.clear()
+        if nodes_list:
+            self.executor.submit(self._raft_add_nodes, nodes_list)
+            
+    def _raft_add_nodes(self, nodes_list: List[dict]):
+        """Use Raft to add a batch of nodes (async operation)"""
         try:
-            result = self.add_node_command(node_data)
-            logger.info(f"Raft add node result: {result}")
+            result = self.add_nodes_command(nodes_list)
+            logger.info(f"Raft add nodes result: {result}")
         except Exception as e:
-            logger.error(f"Raft add node failed: {e}")
+            logger.error(f"Raft add nodes failed: {e}")
             
     def _raft_remove_node(self, node_id: str):
         """Use Raft to remove a node (async operation)"""
@@ -307,20 +602,55 @@ class GatewayService:
         self._send_gossip_to_peers(message)
         
     def _send_gossip_to_peers(self, message: GossipMessage):
-        """Send gossip message to all peer gateways"""
-        for peer in self.peer_gateways:
-            self.executor.submit(self._send_gossip_to_peer, peer, message)
+        """Queue gossip message for the next batch sent to all peer gateways"""
+        if self.peer_gateways:
+            self.gossip_outbox.put(message)
             
-    def _send_gossip_to_peer(self, peer_address: str, message: GossipMessage):
-        """Send gossip message to a specific peer"""
+    def _gossip_flush_loop(self):
+        """Background task that drains the outbox into batched gossip sends"""
+        while self.running:
+            try:
+                batch = [self.gossip_outbox.get(timeout=1)]
+            except queue.Empty:
+                continue
+                
+            # Collect whatever else arrives within the batching window
+            deadline = time.monotonic() + self.gossip_batch_window
+            while len(batch) < self.gossip_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.gossip_outbox.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                    
+            self._flush_gossip_batch(batch)
+            
+    def _flush_gossip_batch(self, batch: List[GossipMessage]):
+        """Send a batch of gossip messages to a random subset of peer gateways"""
+        # Only the latest heartbeat per node is worth sending
+        latest = {}
+        for message in batch:
+            latest[message.message_type, message.data.get("node_id")] = message
+        body = encode_gossip({"batch": [message.to_dict() for message in latest.values()]})
+        peers = random.sample(self.peer_gateways, min(self.gossip_fanout, len(self.peer_gateways)))
+        for peer in peers:
+            self.gossip_executor.submit(self._send_gossip_to_peer, peer, body)
+            
+    def _send_gossip_to_peer(self, peer_address: str, body: bytes):
+        """Send an encoded gossip batch to a specific peer"""
         try:
-            response = requests.post(
+            response = self.gossip_session.post(
                 f"http://{peer_address}/gossip",
-                json=message.to_dict(),
+                data=body,
+                headers=GOSSIP_HEADERS,
                 timeout=5
             )
             if response.status_code == 200:
-                logger.debug(f"Gossip sent to {peer_address}")
+                with self.gossip_lock:
+                    self.gossip_bytes_sent += len(body)
+                logger.debug("gossip sent to %s", peer_address)
             else:
                 logger.warning(f"Gossip failed to {peer_address}: {response.status_code}")
         except Exception as e:
@@ -330,11 +660,11 @@ class GatewayService:
         """Process received gossip message"""
         with self.gossip_lock:
             # Avoid processing duplicate messages
-            if message.message_id in self.gossip_messages:
+            if self.gossip_messages.add(message.message_id):
                 return
-            self.gossip_messages.add(message.message_id)
+            self.gossip_received[message.message_type] += 1
             
-        logger.info(f"Processing gossip: {message.message_type} from {message.sender_id}")
+        logger.debug("gossip %s from %s", message.message_type, message.sender_id)
         
         if message.message_type == "HEARTBEAT":
             # Update node heartbeat info
@@ -343,27 +673,82 @@ class GatewayService:
             
             with self.node_lock:
                 if node_id in self.nodes:
-                    self.nodes[node_id].last_heartbeat = data["timestamp"]
-                    self.nodes[node_id].status = "active"
+                    self._record_heartbeat(self.nodes[node_id], data["timestamp"])
         
-        # Propagate gossip to other peers (with hop limit to prevent loops)
-        if message.sender_id != self.gateway_id:
-            self._send_gossip_to_peers(message)
+        # Messages are not forwarded; peers that missed one catch up through
+        # the periodic digest exchange
+    
+    def _gossip_digest_loop(self):
+        """Background anti-entropy: pull node entries that peers have newer"""
+        while self.running:
+            for peer in self.peer_gateways:
+                try:
+                    self._sync_with_peer(peer)
+                except Exception as e:
+                    logger.warning(f"Digest sync with {peer} failed: {e}")
+                    
+            time.sleep(self.gossip_interval)
+            
+    def _sync_with_peer(self, peer_address: str):
+        """Compare digests with a peer and fetch only the entries we lag on"""
+        response = self.gossip_session.get(f"http://{peer_address}/digest", timeout=5)
+        response.raise_for_status()
+        digest = json_loads(response.content)
+        
+        with self.node_lock.read():
+            stale = [node_id for node_id, heartbeat in digest.items()
+                     if node_id not in self.nodes or int(self.nodes[node_id].last_heartbeat) < heartbeat]
+        if not stale:
+            return
+            
+        response = self.gossip_session.post(
+            f"http://{peer_address}/digest/entries",
+            data=json_dumps({"node_ids": stale}),
+            headers=JSON_HEADERS,
+            timeout=5
+        )
+        response.raise_for_status()
+        self._apply_digest_entries(json_loads(response.content)["nodes"])
+        
+    def _apply_digest_entries(self, entries: List[dict]):
+        """Merge node entries fetched from a peer's digest"""
+        # Entries a peer still holds for silent nodes must not revive them here
+        cutoff = time.time() - self.heartbeat_timeout
+        for entry in entries:
+            if entry["status"] != "active" or entry["last_heartbeat"] < cutoff:
+                continue
+            node = self.nodes.get(entry["node_id"])
+            if node is None:
+                self._queue_raft_add(entry)
+            elif entry["last_heartbeat"] > node.last_heartbeat:
+                self._record_heartbeat(node, entry["last_heartbeat"])
     
     def _health_check_loop(self):
         """Background task to check node health and remove dead nodes"""
+        prioritize_current_thread()
+        next_check = time.monotonic()
         while self.running:
             try:
-                current_time = time.time()
-                dead_nodes = []
+                cutoff = time.time() - self.heartbeat_timeout
                 
-                with self.node_lock:
-                    for node_id, node in self.nodes.items():
-                        if current_time - node.last_heartbeat > self.heartbeat_timeout:
-                            if node.status != "dead":
+                # Scan under the shared lock; most passes find nothing to change
+                with self.node_lock.read():
+                    # One pass with the cutoff hoisted out of the comparison
+                    stale = [node_id for node_id, node in self.nodes.items()
+                             if node.last_heartbeat < cutoff and node.status != STATUS_DEAD]
+                
+                dead_nodes = []
+                if stale:
+                    with self.node_lock:
+                        # Re-check, a heartbeat may have arrived in between
+                        for node_id in stale:
+                            node = self.nodes.get(node_id)
+                            if node and node.last_heartbeat < cutoff and node.status != STATUS_DEAD:
                                 logger.warning(f"Node {node_id} appears dead")
-                                node.status = "dead"
+                                node.status = STATUS_DEAD
                                 dead_nodes.append(node_id)
+                        if dead_nodes:
+                            self.nodes_version += 1
                 
                 # Remove dead nodes via Raft
                 for node_id in dead_nodes:
@@ -372,7 +757,14 @@ class GatewayService:
             except Exception as e:
                 logger.error(f"Health check error: {e}")
                 
-            time.sleep(self.health_check_interval)
+            # Sleep to an absolute deadline so late wakeups do not accumulate
+            next_check += self.health_check_interval
+            delay = next_check - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind by more than a whole interval; start afresh
+                next_check = time.monotonic()
     
     def start(self):
         """Start the gateway service"""
@@ -382,14 +774,33 @@ class GatewayService:
         health_thread = threading.Thread(target=self._health_check_loop, daemon=True)
         health_thread.start()
         
+        # Start gossip batching thread
+        gossip_thread = threading.Thread(target=self._gossip_flush_loop, daemon=True)
+        gossip_thread.start()
+        
+        # Start anti-entropy digest thread
+        digest_thread = threading.Thread(target=self._gossip_digest_loop, daemon=True)
+        digest_thread.start()
+        
         logger.info(f"Starting Gateway Service {self.gateway_id} on port {self.listen_port}")
         
-        # Start Flask app
-        self.app.run(host='0.0.0.0', port=self.listen_port, threaded=True)
+        # Serve the Flask app with waitress's thread pool when available; the
+        # development server spawns a new thread per request
+        if create_server is None:
+            self.app.run(host='0.0.0.0', port=self.listen_port, threaded=True)
+            return
+        self.server = create_server(self.app, host='0.0.0.0', port=self.listen_port,
+                                    threads=self.server_threads)
+        self.server.run()
         
     def stop(self):
         """Stop the gateway service"""
         self.running = False
+        if self.server is not None:
+            self.server.close()
+            self.server.task_dispatcher.shutdown()
+        self.gossip_executor.shutdown(wait=False)
+        self.gossip_session.close()
         logger.info("Gateway service stopped")
 
 
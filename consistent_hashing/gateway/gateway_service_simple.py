@@ -6,36 +6,126 @@ and gossips heartbeat information with other gateway instances.
 Note: Raft consensus removed for simplicity in testing.
 """
 
+import functools
+import itertools
+from collections import Counter
 import json
 import logging
+import os
+import random
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Tuple
 import uuid
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 try:
     from .simple_hash_ring import SimpleHashRing
+    from .bloom_filter import RotatingBloomFilter
+    from .rwlock import ReadWriteLock
 except ImportError:
     from simple_hash_ring import SimpleHashRing
+    from bloom_filter import RotatingBloomFilter
+    from rwlock import ReadWriteLock
+import queue
 import requests
+from requests.adapters import HTTPAdapter
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    from json import dumps as json_dumps, loads as json_loads
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; gossip between gateways falls back to JSON
+    msgpack = None
+
+try:
+    from waitress import create_server
+except ImportError:  # waitress is optional; fall back to Flask's dev server
+    create_server = None
+
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+MSGPACK_MIMETYPE = "application/msgpack"
+GOSSIP_HEADERS = {"Content-Type": MSGPACK_MIMETYPE} if msgpack is not None else JSON_HEADERS
+
+# Gossip message IDs are "<sender>:<boot id>:<sequence>"; the random boot id
+# keeps them unique across restarts without a uuid4() call per message
+_BOOT_ID = uuid.uuid4().hex[:8]
+_message_seq = itertools.count()
+
+# Node statuses are small ints internally; the API reports them by name
+STATUS_ACTIVE, STATUS_INACTIVE, STATUS_DEAD = 0, 1, 2
+STATUS_NAMES = ("active", "inactive", "dead")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """Build a JSON response without going through Flask's stdlib-based jsonify"""
+    return Response(json_dumps(obj), status=status, mimetype="application/json")
+
+
+def parse_json_body():
+    """Parse the current request body as JSON (None if the body is empty)"""
+    body = request.get_data(cache=False)
+    return json_loads(body) if body else None
+
+
+def encode_gossip(payload) -> bytes:
+    """Encode a gateway-to-gateway gossip body (msgpack when available)"""
+    if msgpack is not None:
+        return msgpack.packb(payload)
+    return json_dumps(payload)
+
+
+def parse_gossip_body():
+    """Parse the current gossip request body according to its content type"""
+    if request.mimetype == MSGPACK_MIMETYPE:
+        if msgpack is None:
+            raise ValueError("msgpack gossip is not supported by this gateway")
+        return msgpack.unpackb(request.get_data(cache=False))
+    return parse_json_body()
+
+
+def prioritize_current_thread(cpu: Optional[int] = None, fifo_priority: int = 10):
+    """Pin the calling thread to one CPU and give it real-time priority.
+
+    Used for the health-check thread so its wakeups are not delayed by busy
+    request workers. Both steps are best effort: they need Linux, and
+    SCHED_FIFO additionally needs CAP_SYS_NICE.
+    """
+    try:
+        if cpu is None:
+            cpu = max(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpu})
+    except (AttributeError, OSError) as e:
+        logger.debug("could not pin thread to CPU %s: %s", cpu, e)
+        
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+    except (AttributeError, OSError) as e:
+        logger.debug("could not set SCHED_FIFO: %s", e)
+
 
 class NodeInfo:
     """Information about a KV store node"""
+    __slots__ = ("node_id", "address", "port", "last_heartbeat", "status")
+    
     def __init__(self, node_id: str, address: str, port: int):
         self.node_id = node_id
         self.address = address
         self.port = port
         self.last_heartbeat = time.time()
-        self.status = "active"  # active, inactive, dead
+        self.status = STATUS_ACTIVE  # One of the STATUS_* codes
         
     def to_dict(self):
         return {
@@ -43,21 +133,23 @@ class NodeInfo:
             "address": self.address,
             "port": self.port,
             "last_heartbeat": self.last_heartbeat,
-            "status": self.status
+            "status": STATUS_NAMES[self.status]
         }
         
     @classmethod
     def from_dict(cls, data):
         node = cls(data["node_id"], data["address"], data["port"])
         node.last_heartbeat = data["last_heartbeat"]
-        node.status = data["status"]
+        node.status = STATUS_CODES[data["status"]]
         return node
 
 
 class GossipMessage:
     """Message format for gossip protocol"""
+    __slots__ = ("message_id", "message_type", "sender_id", "data", "timestamp")
+    
     def __init__(self, message_type: str, sender_id: str, data: dict):
-        self.message_id = str(uuid.uuid4())
+        self.message_id = f"{sender_id}:{_BOOT_ID}:{next(_message_seq)}"
         self.message_type = message_type  # HEARTBEAT, NODE_UPDATE, RING_SYNC
         self.sender_id = sender_id
         self.data = data
@@ -74,8 +166,13 @@ class GossipMessage:
         
     @classmethod
     def from_dict(cls, data):
-        msg = cls(data["message_type"], data["sender_id"], data["data"])
+        # Received messages keep the sender's ID and timestamp, so skip
+        # __init__ rather than generate values only to overwrite them
+        msg = cls.__new__(cls)
         msg.message_id = data["message_id"]
+        msg.message_type = data["message_type"]
+        msg.sender_id = data["sender_id"]
+        msg.data = data["data"]
         msg.timestamp = data["timestamp"]
         return msg
 
@@ -90,27 +187,64 @@ class SimpleGatewayService:
         
         # Hash ring for consistent hashing
         self.hash_ring = SimpleHashRing()
+        # Recently looked-up keys map straight to their node; the cache is
+        # cleared whenever ring membership changes
+        self.lookup_node = functools.lru_cache(maxsize=65536)(
+            lambda key: self.hash_ring.get_node(key))
         
         # Node management
         self.nodes: Dict[str, NodeInfo] = {}
-        self.node_lock = threading.RLock()
+        self.node_lock = ReadWriteLock()  # Read-only routes share it
+        # Encoded /nodes response tagged with the nodes_version it was built
+        # from; any change to the node table bumps the version
+        self.nodes_json_cache: Optional[Tuple[int, bytes]] = None
+        self.nodes_version = 0
+        # Active node count, tagged with the nodes_version it was counted at
+        self.active_count_cache: Tuple[int, int] = (-1, 0)
         
         # Gossip protocol
-        self.gossip_messages: Set[str] = set()  # Track seen message IDs
+        # Recently seen message IDs, in fixed memory (old IDs rotate out)
+        self.gossip_messages = RotatingBloomFilter(capacity=100000, error_rate=0.001)
         self.gossip_lock = threading.RLock()
+        # Outgoing messages wait here briefly so they can be sent as one batch
+        self.gossip_outbox: "queue.Queue[GossipMessage]" = queue.Queue()
+        self.gossip_bytes_sent = 0  # Payload bytes delivered to peers
+        self.gossip_received = Counter()  # Accepted gossip messages by type
         
         # Configuration
         self.heartbeat_timeout = 30  # seconds
         self.gossip_interval = 5     # seconds
         self.health_check_interval = 10  # seconds
+        self.gossip_batch_window = 0.5   # seconds to coalesce outgoing gossip
+        self.gossip_batch_size = 100     # max messages per gossip POST
+        self.gossip_fanout = 3           # peers each batch is pushed to; digests reach the rest
+        self.health_check_workers = 16   # nodes pinged in parallel per health check
+        self.server_threads = 16  # HTTP worker threads
         
         # Flask app for HTTP API
         self.app = Flask(__name__)
         self.setup_routes()
         
         # Threading
-        self.executor = ThreadPoolExecutor(max_workers=10)
         self.running = False
+        self.server = None
+        
+        # Gossip sends run on their own pool sized to the peer count, reusing
+        # keep-alive connections from one shared session
+        gossip_workers = max(1, len(self.peer_gateways))
+        self.gossip_executor = ThreadPoolExecutor(max_workers=gossip_workers,
+                                                  thread_name_prefix="gossip")
+        self.gossip_session = requests.Session()
+        self.gossip_session.mount("http://", HTTPAdapter(
+            pool_connections=gossip_workers, pool_maxsize=gossip_workers))
+        
+        # Health pings fan out over their own pool so a check takes about one
+        # timeout rather than one per node
+        self.health_executor = ThreadPoolExecutor(max_workers=self.health_check_workers,
+                                                  thread_name_prefix="health")
+        self.health_session = requests.Session()
+        self.health_session.mount("http://", HTTPAdapter(
+            pool_connections=self.health_check_workers, pool_maxsize=self.health_check_workers))
             
     def _add_node_to_ring(self, node_data: dict) -> bool:
         """Internal method to add node to hash ring"""
@@ -120,10 +254,12 @@ class SimpleGatewayService:
                 if node_id not in self.nodes:
                     node = NodeInfo.from_dict(node_data)
                     self.nodes[node_id] = node
+                    self.nodes_version += 1
                     
                 # Update hash ring
                 self.hash_ring.add_node(node_id)
-                logger.info(f"Added node {node_id} to hash ring")
+                self.lookup_node.cache_clear()
+                logger.info("Added node %s to hash ring", node_id)
                 return True
         except Exception as e:
             logger.error(f"Failed to add node to ring: {e}")
@@ -135,15 +271,44 @@ class SimpleGatewayService:
             with self.node_lock:
                 if node_id in self.nodes:
                     del self.nodes[node_id]
+                    self.nodes_version += 1
                     
                 # Update hash ring
                 self.hash_ring.remove_node(node_id)
-                logger.info(f"Removed node {node_id} from hash ring")
+                self.lookup_node.cache_clear()
+                logger.info("Removed node %s from hash ring", node_id)
                 return True
         except Exception as e:
             logger.error(f"Failed to remove node from ring: {e}")
             return False
     
+    def _record_heartbeat(self, node: NodeInfo, timestamp: float):
+        """Refresh a node's heartbeat.
+        
+        Needs no lock: the attribute stores are atomic, and the version is
+        bumped after them so a /nodes body built concurrently is discarded.
+        """
+        # Only a status change or a new whole second invalidates the cached
+        # /nodes body, so a burst of heartbeats doesn't rebuild it every time
+        changed = node.status != STATUS_ACTIVE or int(timestamp) != int(node.last_heartbeat)
+        node.last_heartbeat = timestamp
+        node.status = STATUS_ACTIVE
+        if changed:
+            self.nodes_version += 1
+    
+    def _count_active_nodes(self) -> int:
+        """Number of active nodes; recounted only after the node table changes.
+        
+        Every status change bumps nodes_version, so the cached count is exact
+        for the version it is tagged with. Callers hold the read lock.
+        """
+        version, count = self.active_count_cache
+        if version != self.nodes_version:
+            version = self.nodes_version
+            count = sum(1 for n in self.nodes.values() if n.status == STATUS_ACTIVE)
+            self.active_count_cache = (version, count)
+        return count
+    
     def setup_routes(self):
         """Setup Flask routes for the gateway API"""
         
@@ -151,109 +316,201 @@ class SimpleGatewayService:
         def receive_heartbeat():
             """Receive heartbeat from KV store nodes"""
             try:
-                data = request.get_json()
+                data = parse_json_body()
                 node_id = data.get('node_id')
                 address = data.get('address')
                 port = data.get('port', 8080)
                 
-                if not node_id or not address:
-                    return jsonify({"error": "Missing node_id or address"}), 400
+                # Known nodes may send compact heartbeats without their
+                # address, which never changes after registration
+                node = self.nodes.get(node_id) if node_id else None
+                if not node_id or (node is None and not address):
+                    return json_response({"error": "Missing node_id or address"}, 400)
                 
-                # Update or create node info
-                with self.node_lock:
-                    if node_id not in self.nodes:
-                        # New node - add it directly (simplified without Raft)
-                        node_data = {
-                            "node_id": node_id,
-                            "address": address, 
-                            "port": port,
-                            "last_heartbeat": time.time(),
-                            "status": "active"
-                        }
-                        self._add_node_to_ring(node_data)
-                    else:
-                        # Existing node - update heartbeat
-                        self.nodes[node_id].last_heartbeat = time.time()
-                        self.nodes[node_id].status = "active"
+                # Existing node - refresh its heartbeat without taking the lock
+                if node is not None:
+                    self._record_heartbeat(node, time.time())
+                    if not address:
+                        address, port = node.address, node.port
+                else:
+                    with self.node_lock:
+                        if node_id not in self.nodes:
+                            # New node - add it directly (simplified without Raft)
+                            node_data = {
+                                "node_id": node_id,
+                                "address": address, 
+                                "port": port,
+                                "last_heartbeat": time.time(),
+                                "status": "active"
+                            }
+                            self._add_node_to_ring(node_data)
+                        else:
+                            # Registered by a concurrent heartbeat
+                            self._record_heartbeat(self.nodes[node_id], time.time())
                 
                 # Gossip heartbeat to other gateways
                 self._gossip_heartbeat(node_id, address, port)
                 
-                return jsonify({"status": "heartbeat_received"}), 200
+                return json_response({"status": "heartbeat_received"}, 200)
                 
             except Exception as e:
                 logger.error(f"Error processing heartbeat: {e}")
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}, 500)
         
         @self.app.route('/nodes', methods=['GET'])
         def get_nodes():
-            """Get all nodes in the ring"""
-            with self.node_lock:
+            """Get all nodes in the ring.
+            
+            Served from a cached body: membership and status changes show up
+            immediately, but last_heartbeat may lag by up to one second since
+            heartbeats within the same second don't invalidate the cache.
+            
+            Large tables can be fetched in pages with ?limit=N&offset=M; paged
+            responses are built directly and also report the total node count.
+            """
+            if 'limit' in request.args or 'offset' in request.args:
+                try:
+                    limit = int(request.args.get('limit', 100))
+                    offset = int(request.args.get('offset', 0))
+                except ValueError:
+                    return json_response({"error": "limit and offset must be integers"}, 400)
+                if limit < 0 or offset < 0:
+                    return json_response({"error": "limit and offset must be non-negative"}, 400)
+                    
+                with self.node_lock.read():
+                    page = itertools.islice(self.nodes.items(), offset, offset + limit)
+                    nodes = {nid: node.to_dict() for nid, node in page}
+                    total = len(self.nodes)
+                return json_response({"nodes": nodes, "total": total}, 200)
+                
+            # The cache is published as one immutable (version, body) tuple and
+            # writers bump the version after mutating, so a hit needs no lock
+            cached = self.nodes_json_cache
+            if cached is not None and cached[0] == self.nodes_version:
+                return Response(cached[1], status=200, mimetype="application/json")
+                
+            with self.node_lock.read():
+                # Tag with the version read before building, so a change
+                # made meanwhile forces another rebuild next time
+                version = self.nodes_version
                 nodes = {nid: node.to_dict() for nid, node in self.nodes.items()}
-            return jsonify({"nodes": nodes}), 200
+                body = json_dumps({"nodes": nodes})
+                self.nodes_json_cache = (version, body)
+            return Response(body, status=200, mimetype="application/json")
             
         @self.app.route('/nodes/<key>', methods=['GET'])
         def get_node_for_key(key):
             """Get the node responsible for a given key"""
             try:
                 if not self.hash_ring.nodes:
-                    return jsonify({"error": "No nodes in ring"}), 404
+                    return json_response({"error": "No nodes in ring"}, 404)
                     
-                node_id = self.hash_ring.get_node(key)
-                with self.node_lock:
+                with self.node_lock.read():
+                    # Looked up under the lock so a concurrent ring change
+                    # can't leave a stale entry in the cache
+                    node_id = self.lookup_node(key)
                     node_info = self.nodes.get(node_id)
                     if node_info:
-                        return jsonify({
+                        return json_response({
                             "key": key,
                             "node": node_info.to_dict()
-                        }), 200
+                        }, 200)
                     else:
-                        return jsonify({"error": "Node not found"}), 404
+                        return json_response({"error": "Node not found"}, 404)
                         
             except Exception as e:
                 logger.error(f"Error getting node for key: {e}")
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}, 500)
+                
+        @self.app.route('/nodes/lookup', methods=['POST'])
+        def get_nodes_for_keys():
+            """Get the nodes responsible for a batch of keys in one round trip"""
+            try:
+                data = parse_json_body()
+                keys = data.get('keys') if data else None
+                
+                if not isinstance(keys, list):
+                    return json_response({"error": "Missing keys list"}, 400)
+                    
+                if not self.hash_ring.nodes:
+                    return json_response({"error": "No nodes in ring"}, 404)
+                    
+                mapping = {}
+                with self.node_lock.read():
+                    for key in keys:
+                        node_info = self.nodes.get(self.lookup_node(key))
+                        mapping[key] = node_info.to_dict() if node_info else None
+                        
+                return json_response({"mapping": mapping}, 200)
+                
+            except Exception as e:
+                logger.error(f"Error getting nodes for keys: {e}")
+                return json_response({"error": str(e)}, 500)
                 
         @self.app.route('/ring/status', methods=['GET'])
         def get_ring_status():
             """Get hash ring status and statistics"""
-            with self.node_lock:
-                return jsonify({
+            with self.gossip_lock:
+                gossip_received = dict(self.gossip_received)
+            with self.node_lock.read():
+                return json_response({
                     "gateway_id": self.gateway_id,
                     "total_nodes": len(self.nodes),
-                    "active_nodes": len([n for n in self.nodes.values() if n.status == "active"]),
+                    "active_nodes": self._count_active_nodes(),
                     "ring_nodes": list(self.hash_ring.nodes),
                     "peer_gateways": self.peer_gateways,
+                    "gossip_bytes_sent": self.gossip_bytes_sent,
+                    "gossip_received": gossip_received,
+                    "virtual_nodes": self.hash_ring.virtual_nodes,  # Lets clients mirror the ring locally
                     "simplified": True  # Indicate this is simplified version
-                }), 200
+                }, 200)
+                
+        @self.app.route('/digest', methods=['GET'])
+        def get_digest():
+            """Compact {node_id: heartbeat second} summary for anti-entropy sync"""
+            with self.node_lock.read():
+                digest = {node_id: int(node.last_heartbeat) for node_id, node in self.nodes.items()}
+            return json_response(digest, 200)
+            
+        @self.app.route('/digest/entries', methods=['POST'])
+        def get_digest_entries():
+            """Full node entries for the node IDs a peer found stale"""
+            data = parse_json_body()
+            node_ids = data.get('node_ids') if data else None
+            if not isinstance(node_ids, list):
+                return json_response({"error": "Missing node_ids list"}, 400)
                 
+            with self.node_lock.read():
+                nodes = [self.nodes[node_id].to_dict() for node_id in node_ids if node_id in self.nodes]
+            return json_response({"nodes": nodes}, 200)
+            
         @self.app.route('/gossip', methods=['POST'])
         def receive_gossip():
             """Receive gossip messages from other gateways"""
             try:
-                data = request.get_json()
-                message = GossipMessage.from_dict(data)
+                data = parse_gossip_body()
                 
-                # Process gossip message
-                self._process_gossip_message(message)
+                # Peers send batches; a bare message is still accepted
+                for message_data in data.get("batch", [data]):
+                    self._process_gossip_message(GossipMessage.from_dict(message_data))
                 
-                return jsonify({"status": "gossip_received"}), 200
+                return json_response({"status": "gossip_received"}, 200)
                 
             except Exception as e:
                 logger.error(f"Error processing gossip: {e}")
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}, 500)
         
         @self.app.route('/health', methods=['GET'])
         def health_check():
             """Health check endpoint"""
-            with self.node_lock:
-                return jsonify({
+            with self.node_lock.read():
+                return json_response({
                     "status": "healthy",
                     "gateway_id": self.gateway_id,
                     "nodes_count": len(self.nodes),
-                    "active_nodes": len([n for n in self.nodes.values() if n.status == "active"]),
+                    "active_nodes": self._count_active_nodes(),
                     "timestamp": time.time()
-                }), 200
+                }, 200)
                     
         @self.app.route('/admin/clear_nodes', methods=['POST'])
         def clear_nodes():
@@ -261,52 +518,61 @@ class SimpleGatewayService:
             with self.node_lock:
                 cleared_count = len(self.nodes)
                 self.nodes.clear()
+                self.nodes_version += 1
                 self.hash_ring = SimpleHashRing(virtual_nodes=100)  # Use default virtual nodes count
+                self.lookup_node.cache_clear()
                 logger.info(f"Cleared {cleared_count} nodes from gateway {self.gateway_id}")
-                return jsonify({
+                return json_response({
                     "status": "success",
                     "cleared_nodes": cleared_count,
                     "gateway_id": self.gateway_id
-                }), 200
+                }, 200)
     
     def _check_node_health(self):
         """Check health of all nodes and update their status"""
         current_time = time.time()
+        cutoff = current_time - self.heartbeat_timeout
         dead_nodes = []
         
+        # Split nodes by heartbeat age in a single pass; the lock is released
+        # before the live ones are pinged so heartbeats aren't blocked on I/O
         with self.node_lock:
             logger.info(f"Health check running for {len(self.nodes)} nodes")
+            recent = []
             for node_id, node in self.nodes.items():
-                time_since_heartbeat = current_time - node.last_heartbeat
-                logger.debug(f"Node {node_id}: last heartbeat {time_since_heartbeat:.1f}s ago, status: {node.status}")
-                
-                # Check if node has sent heartbeat recently
-                if time_since_heartbeat > self.heartbeat_timeout:
-                    if node.status != "dead":
-                        logger.warning(f"Node {node_id} heartbeat timeout ({time_since_heartbeat:.1f}s > {self.heartbeat_timeout}s)")
-                        node.status = "dead"
-                        dead_nodes.append(node_id)
-                    continue
-                    
-                # Try to ping the node if heartbeat is still recent
-                try:
-                    health_url = f"http://{node.address}:{node.port}/health"
-                    logger.debug(f"Checking health of {node_id} at {health_url}")
-                    response = requests.get(health_url, timeout=3)
-                    if response.status_code == 200:
-                        if node.status != "active":
-                            logger.info(f"Node {node_id} health check passed - marking as active")
-                        node.status = "active"
-                    else:
-                        if node.status != "dead":
-                            logger.warning(f"Node {node_id} health check failed with status {response.status_code}")
-                            node.status = "dead"
-                            dead_nodes.append(node_id)
-                except Exception as e:
-                    if node.status != "dead":
-                        logger.warning(f"Node {node_id} health check failed: {e}")
-                        node.status = "dead"
-                        dead_nodes.append(node_id)
+                if node.last_heartbeat >= cutoff:
+                    recent.append(node)
+                elif node.status != STATUS_DEAD:
+                    logger.warning(f"Node {node_id} heartbeat timeout "
+                                   f"({current_time - node.last_heartbeat:.1f}s > {self.heartbeat_timeout}s)")
+                    node.status = STATUS_DEAD
+                    dead_nodes.append(node_id)
+            if dead_nodes:
+                self.nodes_version += 1
+        
+        # Ping the nodes whose heartbeat is still recent, concurrently
+        results = self.health_executor.map(self._ping_node, recent)
+        failures = {node.node_id: reason for node, reason in zip(recent, results) if reason}
+        
+        with self.node_lock:
+            changed = False
+            for node in recent:
+                if self.nodes.get(node.node_id) is not node:
+                    continue  # Removed or replaced while we were pinging
+                if node.node_id not in failures:
+                    if node.status != STATUS_ACTIVE:
+                        logger.info(f"Node {node.node_id} health check passed - marking as active")
+                        node.status = STATUS_ACTIVE
+                        changed = True
+                elif node.status != STATUS_DEAD:
+                    logger.warning(f"Node {node.node_id} health check failed {failures[node.node_id]}")
+                    node.status = STATUS_DEAD
+                    dead_nodes.append(node.node_id)
+                    changed = True
+            
+            # Only a status change invalidates the cached /nodes body and count
+            if changed:
+                self.nodes_version += 1
         
         # Remove dead nodes from ring (simplified without Raft)
         if dead_nodes:
@@ -314,6 +580,18 @@ class SimpleGatewayService:
         for node_id in dead_nodes:
             self._remove_node_from_ring(node_id)
     
+    def _ping_node(self, node: NodeInfo) -> Optional[str]:
+        """Ping a node's health endpoint; returns the failure reason, if any"""
+        try:
+            health_url = f"http://{node.address}:{node.port}/health"
+            logger.debug("Checking health of %s at %s", node.node_id, health_url)
+            response = self.health_session.get(health_url, timeout=3)
+            if response.status_code != 200:
+                return f"with status {response.status_code}"
+        except Exception as e:
+            return f": {e}"
+        return None
+    
     def _gossip_heartbeat(self, node_id: str, address: str, port: int):
         """Send heartbeat gossip to other gateways"""
         message = GossipMessage(
@@ -329,20 +607,55 @@ class SimpleGatewayService:
         self._send_gossip_to_peers(message)
         
     def _send_gossip_to_peers(self, message: GossipMessage):
-        """Send gossip message to all peer gateways"""
-        for peer in self.peer_gateways:
-            self.executor.submit(self._send_gossip_to_peer, peer, message)
+        """Queue gossip message for the next batch sent to all peer gateways"""
+        if self.peer_gateways:
+            self.gossip_outbox.put(message)
             
-    def _send_gossip_to_peer(self, peer_address: str, message: GossipMessage):
-        """Send gossip message to a specific peer"""
+    def _gossip_flush_loop(self):
+        """Background task that drains the outbox into batched gossip sends"""
+        while self.running:
+            try:
+                batch = [self.gossip_outbox.get(timeout=1)]
+            except queue.Empty:
+                continue
+                
+            # Collect whatever else arrives within the batching window
+            deadline = time.monotonic() + self.gossip_batch_window
+            while len(batch) < self.gossip_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.gossip_outbox.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                    
+            self._flush_gossip_batch(batch)
+            
+    def _flush_gossip_batch(self, batch: List[GossipMessage]):
+        """Send a batch of gossip messages to a random subset of peer gateways"""
+        # Only the latest heartbeat per node is worth sending
+        latest = {}
+        for message in batch:
+            latest[message.message_type, message.data.get("node_id")] = message
+        body = encode_gossip({"batch": [message.to_dict() for message in latest.values()]})
+        peers = random.sample(self.peer_gateways, min(self.gossip_fanout, len(self.peer_gateways)))
+        for peer in peers:
+            self.gossip_executor.submit(self._send_gossip_to_peer, peer, body)
+            
+    def _send_gossip_to_peer(self, peer_address: str, body: bytes):
+        """Send an encoded gossip batch to a specific peer"""
         try:
-            response = requests.post(
+            response = self.gossip_session.post(
                 f"http://{peer_address}/gossip",
-                json=message.to_dict(),
+                data=body,
+                headers=GOSSIP_HEADERS,
                 timeout=5
             )
             if response.status_code == 200:
-                logger.debug(f"Gossip sent to {peer_address}")
+                with self.gossip_lock:
+                    self.gossip_bytes_sent += len(body)
+                logger.debug("gossip sent to %s", peer_address)
             else:
                 logger.warning(f"Gossip failed to {peer_address}: {response.status_code}")
         except Exception as e:
@@ -352,11 +665,11 @@ class SimpleGatewayService:
         """Process received gossip message"""
         with self.gossip_lock:
             # Avoid processing duplicate messages
-            if message.message_id in self.gossip_messages:
+            if self.gossip_messages.add(message.message_id):
                 return
-            self.gossip_messages.add(message.message_id)
+            self.gossip_received[message.message_type] += 1
             
-        logger.info(f"Processing gossip: {message.message_type} from {message.sender_id}")
+        logger.debug("gossip %s from %s", message.message_type, message.sender_id)
         
         if message.message_type == "HEARTBEAT":
             # Update node heartbeat info
@@ -365,15 +678,60 @@ class SimpleGatewayService:
             
             with self.node_lock:
                 if node_id in self.nodes:
-                    self.nodes[node_id].last_heartbeat = data["timestamp"]
-                    self.nodes[node_id].status = "active"
+                    self._record_heartbeat(self.nodes[node_id], data["timestamp"])
         
-        # Propagate gossip to other peers (with hop limit to prevent loops)
-        if message.sender_id != self.gateway_id:
-            self._send_gossip_to_peers(message)
+        # Messages are not forwarded; peers that missed one catch up through
+        # the periodic digest exchange
+    
+    def _gossip_digest_loop(self):
+        """Background anti-entropy: pull node entries that peers have newer"""
+        while self.running:
+            for peer in self.peer_gateways:
+                try:
+                    self._sync_with_peer(peer)
+                except Exception as e:
+                    logger.warning(f"Digest sync with {peer} failed: {e}")
+                    
+            time.sleep(self.gossip_interval)
+            
+    def _sync_with_peer(self, peer_address: str):
+        """Compare digests with a peer and fetch only the entries we lag on"""
+        response = self.gossip_session.get(f"http://{peer_address}/digest", timeout=5)
+        response.raise_for_status()
+        digest = json_loads(response.content)
+        
+        with self.node_lock.read():
+            stale = [node_id for node_id, heartbeat in digest.items()
+                     if node_id not in self.nodes or int(self.nodes[node_id].last_heartbeat) < heartbeat]
+        if not stale:
+            return
+            
+        response = self.gossip_session.post(
+            f"http://{peer_address}/digest/entries",
+            data=json_dumps({"node_ids": stale}),
+            headers=JSON_HEADERS,
+            timeout=5
+        )
+        response.raise_for_status()
+        self._apply_digest_entries(json_loads(response.content)["nodes"])
+        
+    def _apply_digest_entries(self, entries: List[dict]):
+        """Merge node entries fetched from a peer's digest"""
+        # Entries a peer still holds for silent nodes must not revive them here
+        cutoff = time.time() - self.heartbeat_timeout
+        for entry in entries:
+            if entry["status"] != "active" or entry["last_heartbeat"] < cutoff:
+                continue
+            node = self.nodes.get(entry["node_id"])
+            if node is None:
+                self._add_node_to_ring(entry)
+            elif entry["last_heartbeat"] > node.last_heartbeat:
+                self._record_heartbeat(node, entry["last_heartbeat"])
     
     def _health_check_loop(self):
         """Background task to check node health and remove dead nodes"""
+        prioritize_current_thread()
+        next_check = time.monotonic()
         while self.running:
             try:
                 self._check_node_health()
@@ -381,7 +739,14 @@ class SimpleGatewayService:
             except Exception as e:
                 logger.error(f"Health check error: {e}")
                 
-            time.sleep(self.health_check_interval)
+            # Sleep to an absolute deadline so late wakeups do not accumulate
+            next_check += self.health_check_interval
+            delay = next_check - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind by more than a whole interval; start afresh
+                next_check = time.monotonic()
     
     def start(self):
         """Start the gateway service"""
@@ -391,14 +756,35 @@ class SimpleGatewayService:
         health_thread = threading.Thread(target=self._health_check_loop, daemon=True)
         health_thread.start()
         
+        # Start gossip batching thread
+        gossip_thread = threading.Thread(target=self._gossip_flush_loop, daemon=True)
+        gossip_thread.start()
+        
+        # Start anti-entropy digest thread
+        digest_thread = threading.Thread(target=self._gossip_digest_loop, daemon=True)
+        digest_thread.start()
+        
         logger.info(f"Starting Simplified Gateway Service {self.gateway_id} on port {self.listen_port}")
         
-        # Start Flask app
-        self.app.run(host='0.0.0.0', port=self.listen_port, threaded=True)
+        # Serve the Flask app with waitress's thread pool when available; the
+        # development server spawns a new thread per request
+        if create_server is None:
+            self.app.run(host='0.0.0.0', port=self.listen_port, threaded=True)
+            return
+        self.server = create_server(self.app, host='0.0.0.0', port=self.listen_port,
+                                    threads=self.server_threads)
+        self.server.run()
         
     def stop(self):
         """Stop the gateway service"""
         self.running = False
+        if self.server is not None:
+            self.server.close()
+            self.server.task_dispatcher.shutdown()
+        self.gossip_executor.shutdown(wait=False)
+        self.gossip_session.close()
+        self.health_executor.shutdown(wait=False)
+        self.health_session.close()
         logger.info("Gateway service stopped")
 
 
@@ -0,0 +1,120 @@
+"""
+Maglev Lookup Table for Consistent Hashing
+
+Implements Google's Maglev hashing: every node gets a permutation of the
+table slots and the nodes take turns claiming their next preferred free
+slot. Lookups are then a single hash plus a list index, independent of the
+number of nodes, while adding or removing a node moves only a small share
+of the keys.
+"""
+
+import hashlib
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+
+# The node set and the lookup table built from it, published together
+RingState = Tuple[FrozenSet[str], List[str]]
+
+
+def _hash64(data: bytes) -> int:
+    """64-bit hash used for both keys and node permutations"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class MaglevRing:
+    """Consistent hash ring backed by a Maglev lookup table.
+
+    Membership changes build a complete new table and then publish it with a
+    single assignment, so lookups never see a half-built table. Callers can
+    also split the two steps with ``prepare`` and ``install`` to do the
+    expensive build outside their own locks.
+    """
+
+    def __init__(self, table_size: int = 65537, nodes: Iterable[str] = ()):
+        # The table size should be prime and much larger than the node count
+        # so every node's permutation visits each slot exactly once
+        self.table_size = table_size
+        self._state: RingState = (frozenset(), [])
+        self.add_nodes(nodes)
+
+    @property
+    def nodes(self) -> FrozenSet[str]:
+        return self._state[0]
+
+    @property
+    def table(self) -> List[str]:
+        return self._state[1]
+
+    def _permutation(self, node_id: str):
+        """Return (offset, skip) defining a node's preferred slot order"""
+        digest = hashlib.blake2b(node_id.encode(), digest_size=16).digest()
+        offset = int.from_bytes(digest[:8], "little") % self.table_size
+        skip = int.from_bytes(digest[8:], "little") % (self.table_size - 1) + 1
+        return offset, skip
+
+    def _build_table(self, nodes: FrozenSet[str]) -> List[str]:
+        """Fill a lookup table by letting nodes claim slots in turn"""
+        if not nodes:
+            return []
+
+        size = self.table_size
+        # Sort so every gateway builds the same table for the same node set
+        node_ids = sorted(nodes)
+        permutations = [self._permutation(node_id) for node_id in node_ids]
+        next_index = [0] * len(node_ids)
+        table: List[Optional[str]] = [None] * size
+        filled = 0
+
+        while True:
+            for i, node_id in enumerate(node_ids):
+                offset, skip = permutations[i]
+                slot = (offset + next_index[i] * skip) % size
+                while table[slot] is not None:
+                    next_index[i] += 1
+                    slot = (offset + next_index[i] * skip) % size
+                table[slot] = node_id
+                next_index[i] += 1
+                filled += 1
+                if filled == size:
+                    return table
+
+    def prepare(self, add: Iterable[str] = (), remove: Iterable[str] = ()) -> Optional[RingState]:
+        """Build the state for a membership change without applying it.
+
+        Returns None when the change leaves membership as it is. Only one
+        prepare/install sequence may run at a time, or the later install
+        would drop the earlier change.
+        """
+        nodes = (self.nodes | frozenset(add)) - frozenset(remove)
+        if nodes == self.nodes:
+            return None
+        return nodes, self._build_table(nodes)
+
+    def install(self, state: Optional[RingState]):
+        """Publish a state returned by prepare"""
+        if state is not None:
+            self._state = state
+
+    def add_nodes(self, node_ids: Iterable[str]):
+        """Add several nodes with a single table rebuild"""
+        self.install(self.prepare(add=node_ids))
+
+    def remove_nodes(self, node_ids: Iterable[str]):
+        """Remove several nodes with a single table rebuild"""
+        self.install(self.prepare(remove=node_ids))
+
+    def add_node(self, node_id: str):
+        """Add a node and rebuild the lookup table"""
+        self.add_nodes((node_id,))
+
+    def remove_node(self, node_id: str):
+        """Remove a node and rebuild the lookup table"""
+        self.remove_nodes((node_id,))
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Get the node responsible for a key"""
+        table = self._state[1]
+        if not table:
+            return None
+
+        return table[_hash64(key.encode()) % self.table_size]
@@ -0,0 +1,108 @@
+"""
+Reader-Writer Lock for Gateway Node State
+
+Lets read-only routes inspect the node table concurrently while updates
+still get exclusive access.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """Reentrant reader-writer lock that favours waiting writers.
+
+    ``read()`` may be held by many threads at once; ``write()`` is exclusive.
+    Using the lock directly (``with lock:``, ``acquire``/``release``) takes
+    the write side, so it is a drop-in replacement for ``threading.RLock``.
+    A thread holding the write lock may also take the read lock, but a
+    reader must not try to upgrade to the write lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # ident of the thread holding the write lock
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        depth = getattr(self._local, "reads", 0)
+        with self._cond:
+            # Nested reads (and reads by the writer) must not wait, or a queued
+            # writer would deadlock against a thread that already holds the lock
+            if not depth and self._writer != me:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+            self._readers += 1
+        self._local.reads = depth + 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            self._local.reads -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """Acquire the write lock (same signature as threading.RLock.acquire)"""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return True
+            if not blocking:
+                timeout = 0
+            elif timeout < 0:
+                timeout = None
+
+            self._writers_waiting += 1
+            try:
+                acquired = self._cond.wait_for(
+                    lambda: self._writer is None and self._readers == 0, timeout)
+            finally:
+                self._writers_waiting -= 1
+            if not acquired:
+                # Readers held back for this writer may proceed again
+                self._cond.notify_all()
+                return False
+            self._writer = me
+            self._write_depth = 1
+            return True
+
+    def release(self):
+        """Release the write lock"""
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._cond.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    @contextmanager
+    def read(self):
+        """Hold the lock shared for the duration of the block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively for the duration of the block"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
@@ -4,6 +4,7 @@ Simple Hash Ring Implementation for Consistent Hashing
 A basic implementation of consistent hashing for the gateway service.
 """
 
+import bisect
 import hashlib
 from typing import List, Optional
 
@@ -15,11 +16,24 @@ class SimpleHashRing:
         self.virtual_nodes = virtual_nodes
         self.ring = {}  # hash -> node_id
         self.sorted_keys = []
+        # Owner of each entry in sorted_keys, so lookups index a list
+        # instead of probing the ring dict
+        self._owners: List[str] = []
         self.nodes = set()
         
     def _hash(self, key: str) -> int:
         """Generate hash for a key"""
-        return int(hashlib.md5(key.encode()).hexdigest(), 16)
+        return self._hash_bytes(key.encode())
+    
+    @staticmethod
+    def _hash_bytes(data: bytes) -> int:
+        """64-bit hash of raw bytes; no hex round-trip"""
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+    
+    def _virtual_keys(self, node_id: str) -> List[bytes]:
+        """Encoded keys of a node's virtual nodes: node ID, ':' and the index as raw bytes"""
+        prefix = node_id.encode() + b":"
+        return [prefix + i.to_bytes(4, "big") for i in range(self.virtual_nodes)]
     
     def add_node(self, node_id: str):
         """Add a node to the ring"""
@@ -29,13 +43,18 @@ class SimpleHashRing:
         self.nodes.add(node_id)
         
         # Add virtual nodes
-        for i in range(self.virtual_nodes):
-            virtual_key = f"{node_id}:{i}"
-            hash_val = self._hash(virtual_key)
+        new_keys = []
+        for hash_val in map(self._hash_bytes, self._virtual_keys(node_id)):
+            if hash_val not in self.ring:
+                new_keys.append(hash_val)
             self.ring[hash_val] = node_id
             
-        # Keep sorted keys for binary search
-        self.sorted_keys = sorted(self.ring.keys())
+        # Keep sorted keys for binary search. The list is now two sorted runs,
+        # which timsort merges in linear time instead of re-sorting the ring
+        new_keys.sort()
+        self.sorted_keys = self.sorted_keys + new_keys
+        self.sorted_keys.sort()
+        self._owners = [self.ring[k] for k in self.sorted_keys]
         
     def remove_node(self, node_id: str):
         """Remove a node from the ring"""
@@ -45,14 +64,15 @@ class SimpleHashRing:
         self.nodes.remove(node_id)
         
         # Remove virtual nodes
-        for i in range(self.virtual_nodes):
-            virtual_key = f"{node_id}:{i}"
-            hash_val = self._hash(virtual_key)
-            if hash_val in self.ring:
+        removed = set()
+        for hash_val in map(self._hash_bytes, self._virtual_keys(node_id)):
+            if self.ring.get(hash_val) == node_id:
                 del self.ring[hash_val]
+                removed.add(hash_val)
                 
-        # Update sorted keys
-        self.sorted_keys = sorted(self.ring.keys())
+        # Filtering keeps the remaining keys sorted
+        self.sorted_keys = [k for k in self.sorted_keys if k not in removed]
+        self._owners = [self.ring[k] for k in self.sorted_keys]
         
     def get_node(self, key: str) -> Optional[str]:
         """Get the node responsible for a key"""
@@ -62,12 +82,11 @@ class SimpleHashRing:
         hash_val = self._hash(key)
         
         # Find the first node clockwise from the hash
-        for ring_key in self.sorted_keys:
-            if ring_key >= hash_val:
-                return self.ring[ring_key]
-                
-        # Wrap around to the first node
-        return self.ring[self.sorted_keys[0]]
+        idx = bisect.bisect_left(self.sorted_keys, hash_val)
+        if idx == len(self.sorted_keys):
+            # Wrap around to the first node
+            idx = 0
+        return self._owners[idx]
         
     def get_nodes(self, key: str, count: int = 1) -> List[str]:
         """Get multiple nodes for a key (for replication)"""
@@ -78,17 +97,13 @@ class SimpleHashRing:
         result = []
         seen_nodes = set()
         
-        # Start from the position of the key
-        start_idx = 0
-        for i, ring_key in enumerate(self.sorted_keys):
-            if ring_key >= hash_val:
-                start_idx = i
-                break
+        # Start from the position of the key; the modulo below wraps past the end
+        start_idx = bisect.bisect_left(self.sorted_keys, hash_val)
                 
         # Collect unique nodes
         for i in range(len(self.sorted_keys)):
             idx = (start_idx + i) % len(self.sorted_keys)
-            node = self.ring[self.sorted_keys[idx]]
+            node = self._owners[idx]
             
             if node not in seen_nodes:
                 result.append(node)
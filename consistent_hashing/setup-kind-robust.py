@@ -15,9 +15,24 @@ import os
 import time
 import subprocess
 import argparse
+import json
+import random
+import shutil
 import tempfile
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    from kubernetes import client as k8s_client, config as k8s_config, watch as k8s_watch
+except ImportError:  # kubernetes client is optional; fall back to kubectl
+    k8s_client = None
+
+try:
+    import docker
+except ImportError:  # docker SDK is optional; fall back to the docker CLI
+    docker = None
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +42,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Stands in for the node image in pre-rendered cluster configs
+NODE_IMAGE_PLACEHOLDER = '__NODE_IMAGE__'
+
+# Manifest of the pod verify_cluster schedules to prove the cluster works
+_TEST_POD_YAML = """
+apiVersion: v1
+kind: Pod
+metadata:
+  name: cluster-test
+  namespace: default
+spec:
+  containers:
+  - name: test
+    image: busybox:1.35
+    command: ['sleep', '60']
+  restartPolicy: Never
+"""
+
+# Absolute paths of the external tools this script runs, resolved once at
+# import so no command pays for a PATH search (None if not installed)
+_BINARIES: Dict[str, Optional[str]] = {
+    name: shutil.which(name) for name in ('kind', 'kubectl', 'docker', 'free')
+}
+
+
+@contextmanager
+def _temporary_yaml_file(text: str) -> Iterator[str]:
+    """Write text to a temporary .yaml file and yield its path"""
+    if sys.version_info >= (3, 12):
+        # The file outlives close() so other processes can read it, and is
+        # deleted by the context manager itself
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete_on_close=False) as f:
+            f.write(text)
+            f.close()
+            yield f.name
+    else:
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(text)
+        try:
+            yield f.name
+        finally:
+            os.unlink(f.name)
+
 
 class KindClusterManager:
     """Manages Kind cluster creation with robust error handling and fallbacks"""
@@ -46,9 +104,19 @@ class KindClusterManager:
         self.max_retries = max_retries
         self.cluster_context = f"kind-{cluster_name}"
         
-        # Store original KUBECONFIG for restoration
-        self.original_kubeconfig = os.environ.get('KUBECONFIG')
-        self.k3s_kubeconfig_backup = None
+        # Environment for child processes; None inherits os.environ. Set by
+        # _setup_kubeconfig so the process-wide environment is never mutated
+        self._child_env: Optional[Dict[str, str]] = None
+        
+        # Docker SDK client, created on first use so one socket serves all calls
+        self._docker = None
+        
+        # Parsed kubeconfig contexts, keyed by the (path, mtime) pairs they came from
+        self._kubeconfig_cache: Optional[Tuple[Tuple[Tuple[str, float], ...], List[str]]] = None
+        
+        # (monotonic time, names) from the last `kind get clusters`; dropped
+        # whenever this manager creates or deletes a cluster
+        self._cluster_list_cache: Optional[Tuple[float, set]] = None
         
         # Cluster configurations (from simple to complex)
         self.configurations = [
@@ -57,49 +125,75 @@ class KindClusterManager:
             self._get_full_multi_node_config()
         ]
     
+    @staticmethod
+    def _backoff(step: int, base: float = 0.5, factor: float = 1.5,
+                 cap: float = 40.0, jitter: float = 0.1) -> float:
+        """Exponential backoff delay in seconds for the given retry step, with jitter"""
+        delay = min(cap, base * factor ** step)
+        return delay * (1 + random.uniform(-jitter, jitter))
+    
     def _run_command(self, cmd: List[str], timeout: Optional[int] = None, 
-                    check: bool = True, capture_output: bool = True) -> subprocess.CompletedProcess[str]:
-        """Run a command with proper error handling"""
+                    check: bool = True, capture_output: bool = True,
+                    input: Optional[str] = None,
+                    log_on_failure: bool = True) -> subprocess.CompletedProcess[str]:
+        """Run a command with proper error handling.
+        
+        A non-zero exit is logged unless log_on_failure is False, and raises
+        CalledProcessError only if check is set; callers that expect failures
+        pass check=False and inspect returncode instead.
+        """
+        logger.debug(f"Running command: {' '.join(cmd)}")
+        # Exec resolved tools by absolute path so execvp skips the PATH search
+        exec_cmd = [_BINARIES.get(cmd[0]) or cmd[0]] + cmd[1:]
         try:
-            logger.debug(f"Running command: {' '.join(cmd)}")
             result = subprocess.run(
-                cmd, 
+                exec_cmd, 
                 timeout=timeout,
-                check=check,
                 capture_output=capture_output,
+                input=input,
+                env=self._child_env,
                 text=True
             )
-            return result
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Command failed: {' '.join(cmd)}")
-            logger.error(f"Exit code: {e.returncode}")
-            if e.stdout:
-                logger.error(f"Stdout: {e.stdout}")
-            if e.stderr:
-                logger.error(f"Stderr: {e.stderr}")
-            raise
-        except subprocess.TimeoutExpired as e:
+        except subprocess.TimeoutExpired:
             logger.error(f"Command timed out after {timeout}s: {' '.join(cmd)}")
             raise
+        
+        if result.returncode != 0:
+            if log_on_failure:
+                logger.error(f"Command failed: {' '.join(cmd)}")
+                logger.error(f"Exit code: {result.returncode}")
+                if result.stdout:
+                    logger.error(f"Stdout: {result.stdout}")
+                if result.stderr:
+                    logger.error(f"Stderr: {result.stderr}")
+            if check:
+                raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        return result
+    
+    def _docker_client(self) -> Optional[Any]:
+        """Shared Docker SDK client, or None if the SDK is not installed"""
+        if docker is None:
+            return None
+        if self._docker is None:
+            self._docker = docker.from_env()
+        return self._docker
     
     def _check_dependencies(self) -> None:
         """Check if required tools are available"""
         required_tools = ['kind', 'kubectl', 'docker']
-        missing_tools: List[str] = []
-        
-        for tool in required_tools:
-            try:
-                self._run_command(['which', tool], check=True)
-            except subprocess.CalledProcessError:
-                missing_tools.append(tool)
+        missing_tools = [tool for tool in required_tools if _BINARIES[tool] is None]
         
         if missing_tools:
             raise RuntimeError(f"Missing required tools: {', '.join(missing_tools)}")
         
         # Check Docker is running
         try:
-            self._run_command(['docker', 'info'], timeout=10)
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            client = self._docker_client()
+            if client is not None:
+                client.ping()
+            else:
+                self._run_command(['docker', 'info'], timeout=10)
+        except Exception:
             raise RuntimeError("Docker is not running or accessible")
     
     def _setup_kubeconfig(self) -> None:
@@ -107,30 +201,43 @@ class KindClusterManager:
         current_kubeconfig = os.environ.get('KUBECONFIG')
         
         if current_kubeconfig and 'k3s' in current_kubeconfig.lower():
-            logger.warning("Detected K3s KUBECONFIG conflict. Temporarily unsetting KUBECONFIG for Kind...")
-            self.k3s_kubeconfig_backup = current_kubeconfig
-            del os.environ['KUBECONFIG']
-            logger.info("KUBECONFIG temporarily unset to allow Kind to use default config")
+            logger.warning("Detected K3s KUBECONFIG conflict. Leaving KUBECONFIG unset for Kind...")
+            self._child_env = {k: v for k, v in os.environ.items() if k != 'KUBECONFIG'}
+            logger.info("Commands run by this manager will use the default kubeconfig")
         elif current_kubeconfig:
             logger.info(f"Using existing KUBECONFIG: {current_kubeconfig}")
         else:
             logger.info("Using default kubeconfig location: ~/.kube/config")
     
-    def _restore_kubeconfig(self) -> None:
-        """Restore original kubeconfig if it was backed up"""
-        if self.k3s_kubeconfig_backup:
-            logger.info("Restoring K3s KUBECONFIG...")
-            os.environ['KUBECONFIG'] = self.k3s_kubeconfig_backup
-            self.k3s_kubeconfig_backup = None
-        elif self.original_kubeconfig and 'KUBECONFIG' not in os.environ:
-            # Restore original if we unset it
-            os.environ['KUBECONFIG'] = self.original_kubeconfig
+    def _kubeconfig_path(self) -> str:
+        """KUBECONFIG value (possibly a path list) that child processes see"""
+        env = self._child_env if self._child_env is not None else os.environ
+        return env.get('KUBECONFIG') or os.path.expanduser('~/.kube/config')
+    
+    def _kubeconfig_contexts(self) -> List[str]:
+        """Context names from the active kubeconfig files, read without kubectl.
+        
+        The parse is cached and reused until a file's mtime changes, so the
+        contexts kind adds on cluster creation are picked up.
+        """
+        import yaml
+        key = tuple((path, os.path.getmtime(path))
+                    for path in self._kubeconfig_path().split(os.pathsep) if path and os.path.exists(path))
+        if self._kubeconfig_cache is not None and self._kubeconfig_cache[0] == key:
+            return self._kubeconfig_cache[1]
+        
+        contexts: List[str] = []
+        for path, _ in key:
+            with open(path) as f:
+                kubeconfig = yaml.safe_load(f) or {}
+            contexts.extend(c['name'] for c in kubeconfig.get('contexts') or [] if c['name'] not in contexts)
+        self._kubeconfig_cache = (key, contexts)
+        return contexts
     
     def _verify_context_exists(self) -> bool:
         """Verify that the expected kubectl context exists"""
         try:
-            result = self._run_command(['kubectl', 'config', 'get-contexts', '-o', 'name'], check=False)
-            contexts = result.stdout.strip().split('\n') if result.stdout.strip() else []
+            contexts = self._kubeconfig_contexts()
             
             if self.cluster_context in contexts:
                 logger.debug(f"Context '{self.cluster_context}' found")
@@ -143,6 +250,61 @@ class KindClusterManager:
             logger.error(f"Failed to check kubectl contexts: {e}")
             return False
     
+    @staticmethod
+    def _has_true_condition(obj: Any, condition: str) -> bool:
+        """Whether a node or pod reports the given condition as True"""
+        return any(c.type == condition and c.status == 'True'
+                   for c in (obj.status.conditions or []))
+    
+    def _wait_for_nodes_ready_api(self, timeout: int) -> None:
+        """Wait for every node to be Ready over one watch connection"""
+        k8s_config.load_kube_config(config_file=self._kubeconfig_path(), context=self.cluster_context)
+        core = k8s_client.CoreV1Api()
+        ready: Dict[str, bool] = {}
+        
+        watcher = k8s_watch.Watch()
+        for event in watcher.stream(core.list_node, timeout_seconds=timeout):
+            node = event['object']
+            if event['type'] == 'DELETED':
+                ready.pop(node.metadata.name, None)
+                continue
+            ready[node.metadata.name] = self._has_true_condition(node, 'Ready')
+            if ready and all(ready.values()):
+                watcher.stop()
+                return
+        
+        raise TimeoutError(f"Nodes not Ready after {timeout}s: "
+                           f"{[name for name, ok in ready.items() if not ok]}")
+    
+    def _verify_test_pod_api(self, use_context: bool, pod_yaml: str) -> bool:
+        """Create the test pod, wait for it to be Ready and delete it via the API"""
+        import yaml
+        k8s_config.load_kube_config(config_file=self._kubeconfig_path(),
+                                    context=self.cluster_context if use_context else None)
+        core = k8s_client.CoreV1Api()
+        
+        try:
+            core.create_namespaced_pod('default', yaml.safe_load(pod_yaml))
+            watcher = k8s_watch.Watch()
+            for event in watcher.stream(core.list_namespaced_pod, 'default',
+                                        field_selector='metadata.name=cluster-test',
+                                        timeout_seconds=60):
+                if self._has_true_condition(event['object'], 'Ready'):
+                    watcher.stop()
+                    logger.info("✅ Cluster verification successful")
+                    return True
+            logger.error("Cluster verification failed: test pod not Ready after 60s")
+            return False
+        except Exception as e:
+            logger.error(f"Cluster verification failed: {e}")
+            return False
+        finally:
+            # Don't fail verification if cleanup fails
+            try:
+                core.delete_namespaced_pod('cluster-test', 'default', grace_period_seconds=0)
+            except Exception:
+                logger.warning("Pod cleanup failed, but continuing anyway...")
+    
     def _get_single_node_config(self) -> Dict[str, Any]:
         """Get single-node cluster configuration (most reliable)"""
         return {
@@ -242,14 +404,38 @@ nodeRegistration:
             }
         }
     
+    def _config_yaml_template(self, config: Dict[str, Any]) -> str:
+        """Cluster config rendered to YAML once, with a node image placeholder"""
+        template = config.get('yaml_template')
+        if template is None:
+            import yaml
+            nodes = [dict(node, image=NODE_IMAGE_PLACEHOLDER) for node in config["config"]["nodes"]]
+            template = yaml.safe_dump(dict(config["config"], nodes=nodes))
+            config['yaml_template'] = template
+        return template
+    
+    def _list_clusters(self, ttl: float = 2.0) -> set:
+        """Names of existing Kind clusters, reusing a recent answer"""
+        cached = self._cluster_list_cache
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        result = self._run_command(['kind', 'get', 'clusters'], check=False, log_on_failure=False)
+        clusters = set(result.stdout.split())
+        self._cluster_list_cache = (time.monotonic(), clusters)
+        return clusters
+    
     def _cleanup_existing_cluster(self) -> bool:
         """Clean up existing cluster if it exists"""
         try:
             # Check if cluster exists
-            result = self._run_command(['kind', 'get', 'clusters'], check=False)
-            if self.cluster_name in result.stdout:
+            if self.cluster_name in self._list_clusters():
                 logger.info(f"Deleting existing cluster '{self.cluster_name}'...")
-                self._run_command(['kind', 'delete', 'cluster', '--name', self.cluster_name], timeout=120)
+                result = self._run_command(['kind', 'delete', 'cluster', '--name', self.cluster_name],
+                                           timeout=120, check=False)
+                self._cluster_list_cache = None
+                if result.returncode != 0:
+                    logger.warning(f"Error during cleanup: kind delete exited with {result.returncode}")
+                    return False
                 logger.info("Existing cluster deleted")
                 return True
             return False
@@ -261,70 +447,84 @@ nodeRegistration:
         """Create cluster with specific configuration"""
         logger.info(f"Attempting cluster creation: {config['description']}")
         
-        # Add node image to config
-        cluster_config = config["config"].copy()
-        for node in cluster_config["nodes"]:
-            node["image"] = node_image
+        # Add node image to config; a JSON string is also a valid YAML scalar
+        rendered = self._config_yaml_template(config).replace(
+            NODE_IMAGE_PLACEHOLDER, json.dumps(node_image))
         
         try:
-            # Write config to temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-                import yaml
-                yaml.safe_dump(cluster_config, f)
-                config_file = f.name
-            
-            try:
+            # Write config to a temporary file, removed again on exit
+            with _temporary_yaml_file(rendered) as config_file:
                 # Create cluster
                 cmd = ['kind', 'create', 'cluster', '--config', config_file]
-                self._run_command(cmd, timeout=600)
+                try:
+                    self._run_command(cmd, timeout=600)
+                finally:
+                    self._cluster_list_cache = None
                 
                 # Wait for cluster to be ready
                 logger.info("Waiting for cluster to be ready...")
-                self._run_command([
-                    'kubectl', 'cluster-info', 
-                    '--context', self.cluster_context
-                ], timeout=60)
-                
-                # Wait for all nodes to be ready
-                self._run_command([
-                    'kubectl', 'wait', '--for=condition=Ready', 'nodes', '--all',
-                    '--timeout=300s', '--context', self.cluster_context
-                ], timeout=320)
+                if k8s_client is not None:
+                    self._wait_for_nodes_ready_api(timeout=300)
+                else:
+                    self._run_command([
+                        'kubectl', 'cluster-info', 
+                        '--context', self.cluster_context
+                    ], timeout=60)
+                    
+                    # Wait for all nodes to be ready
+                    self._run_command([
+                        'kubectl', 'wait', '--for=condition=Ready', 'nodes', '--all',
+                        '--timeout=300s', '--context', self.cluster_context
+                    ], timeout=320)
                 
                 logger.info(f"✅ Cluster created successfully with {config['name']} configuration")
                 return True, config['name']
                 
-            finally:
-                # Clean up config file
-                os.unlink(config_file)
-                
         except Exception as e:
             logger.error(f"Failed to create cluster with {config['name']} configuration: {e}")
             return False, str(e)
     
+    def _docker_disk_usage(self) -> str:
+        """Docker disk usage summary"""
+        client = self._docker_client()
+        if client is None:
+            return self._run_command(['docker', 'system', 'df'], check=False).stdout
+        usage = client.df()
+        return (f"{len(usage.get('Images') or [])} images, "
+                f"{len(usage.get('Containers') or [])} containers, "
+                f"{len(usage.get('Volumes') or [])} volumes, "
+                f"{usage.get('LayersSize', 0) / 1e9:.2f} GB in layers")
+    
+    def _docker_cluster_containers(self) -> str:
+        """Docker containers belonging to the cluster"""
+        client = self._docker_client()
+        if client is None:
+            return self._run_command(['docker', 'ps', '-a', '--filter', f'name={self.cluster_name}'],
+                                     check=False).stdout
+        containers = client.containers.list(all=True, filters={'name': self.cluster_name})
+        return "\n".join(f"{c.name}\t{c.status}" for c in containers)
+    
     def _diagnose_cluster_issues(self) -> None:
         """Diagnose common cluster issues"""
         logger.info("Diagnosing cluster issues...")
         
-        try:
-            # Check Docker resources
-            result = self._run_command(['docker', 'system', 'df'], check=False)
-            logger.info(f"Docker disk usage:\n{result.stdout}")
-            
-            # Check Docker containers
-            result = self._run_command(['docker', 'ps', '-a', '--filter', f'name={self.cluster_name}'], check=False)
-            logger.info(f"Docker containers for cluster:\n{result.stdout}")
-            
-            # Check system resources
-            result = self._run_command(['free', '-h'], check=False)
-            logger.info(f"Memory usage:\n{result.stdout}")
-            
-            # Check for conflicting kubeconfig
-            kubeconfig = os.environ.get('KUBECONFIG', '~/.kube/config')
-            logger.info(f"KUBECONFIG: {kubeconfig}")
-            
-        except Exception as e:
-            logger.warning(f"Error during diagnosis: {e}")
+        # The probes are independent and mostly wait on Docker or a
+        # subprocess, so run them concurrently
+        probes = {
+            "Docker disk usage": self._docker_disk_usage,
+            "Docker containers for cluster": self._docker_cluster_containers,
+            "Memory usage": lambda: self._run_command(['free', '-h'], check=False).stdout,
+        }
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            futures = {label: executor.submit(probe) for label, probe in probes.items()}
+            for label, future in futures.items():
+                try:
+                    logger.info(f"{label}:\n{future.result()}")
+                except Exception as e:
+                    logger.warning(f"Error during diagnosis ({label}): {e}")
+        
+        # Check for conflicting kubeconfig
+        logger.info(f"KUBECONFIG: {self._kubeconfig_path()}")
     
     def create_cluster(self, node_image: str = "kindest/node:v1.28.0", 
                       force_config: Optional[str] = None) -> bool:
@@ -346,47 +546,53 @@ nodeRegistration:
         # Setup kubeconfig to avoid conflicts
         self._setup_kubeconfig()
         
-        try:
-            # Clean up existing cluster
-            self._cleanup_existing_cluster()
-            
-            # Determine configurations to try
-            configs_to_try = self.configurations
-            if force_config:
-                configs_to_try = [c for c in self.configurations if c['name'] == force_config]
-                if not configs_to_try:
-                    raise ValueError(f"Unknown configuration: {force_config}")
+        # Clean up existing cluster
+        self._cleanup_existing_cluster()
+        
+        # Determine configurations to try
+        configs_to_try = self.configurations
+        if force_config:
+            configs_to_try = [c for c in self.configurations if c['name'] == force_config]
+            if not configs_to_try:
+                raise ValueError(f"Unknown configuration: {force_config}")
+        
+        # Try each configuration with retries, backing off after every
+        # failure so a transient startup problem has time to clear
+        step = 0
+        for attempt in range(self.max_retries):
+            logger.info(f"=== Attempt {attempt + 1}/{self.max_retries} ===")
             
-            # Try each configuration with retries
-            for attempt in range(self.max_retries):
-                logger.info(f"=== Attempt {attempt + 1}/{self.max_retries} ===")
-                
-                for config in configs_to_try:
-                    try:
-                        success, result = self._create_cluster_with_config(config, node_image)
-                        if success:
-                            logger.info(f"🎉 Cluster '{self.cluster_name}' created successfully!")
-                            logger.info(f"Configuration used: {result}")
-                            self._show_cluster_info()
-                            return True
-                    except Exception as e:
-                        logger.error(f"Configuration {config['name']} failed: {e}")
-                        continue
-                
-                # If we get here, all configurations failed for this attempt
-                if attempt < self.max_retries - 1:
-                    logger.warning(f"All configurations failed on attempt {attempt + 1}. Retrying in 10 seconds...")
-                    time.sleep(10)
-                    self._cleanup_existing_cluster()  # Clean up before retry
+            for i, config in enumerate(configs_to_try):
+                if i > 0:
+                    delay = self._backoff(step)
+                    step += 1
+                    logger.info(f"Waiting {delay:.1f}s before trying {config['name']}...")
+                    time.sleep(delay)
+                try:
+                    success, result = self._create_cluster_with_config(config, node_image)
+                    if success:
+                        logger.info(f"🎉 Cluster '{self.cluster_name}' created successfully!")
+                        logger.info(f"Configuration used: {result}")
+                        self._show_cluster_info()
+                        return True
+                except Exception as e:
+                    logger.error(f"Configuration {config['name']} failed: {e}")
+                    continue
             
-            # All attempts failed
-            logger.error("❌ All cluster creation attempts failed!")
-            self._diagnose_cluster_issues()
-            return False
+            # If we get here, all configurations failed for this attempt
+            if attempt < self.max_retries - 1:
+                delay = self._backoff(step)
+                step += 1
+                logger.warning(f"All configurations failed on attempt {attempt + 1}. "
+                               f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+                self._cleanup_existing_cluster()  # Clean up before retry
         
-        finally:
-            # Always restore kubeconfig
-            self._restore_kubeconfig()
+        # All attempts failed
+        logger.error("❌ All cluster creation attempts failed!")
+        self._diagnose_cluster_issues()
+        return False
+
     
     def _show_cluster_info(self) -> None:
         """Show cluster information"""
@@ -396,6 +602,10 @@ nodeRegistration:
             # Check if context exists
             use_context = self._verify_context_exists()
             
+            if k8s_client is not None:
+                self._show_cluster_info_api(use_context)
+                return
+            
             # Node information
             cmd = ['kubectl', 'get', 'nodes', '-o', 'wide']
             if use_context:
@@ -413,6 +623,19 @@ nodeRegistration:
         except Exception as e:
             logger.warning(f"Could not retrieve cluster info: {e}")
     
+    def _show_cluster_info_api(self, use_context: bool) -> None:
+        """Log nodes and the control plane address over one API connection"""
+        api = k8s_config.new_client_from_config(config_file=self._kubeconfig_path(),
+                                                context=self.cluster_context if use_context else None)
+        rows = []
+        for node in k8s_client.CoreV1Api(api).list_node().items:
+            status = 'Ready' if self._has_true_condition(node, 'Ready') else 'NotReady'
+            addresses = [a.address for a in node.status.addresses or [] if a.type == 'InternalIP']
+            rows.append(f"{node.metadata.name}\t{status}\t{node.status.node_info.kubelet_version}\t"
+                        f"{addresses[0] if addresses else '<none>'}")
+        logger.info("Nodes:\n" + "\n".join(rows))
+        logger.info(f"Cluster info:\nKubernetes control plane is running at {api.configuration.host}")
+    
     def delete_cluster(self) -> bool:
         """Delete the Kind cluster"""
         # Setup kubeconfig to avoid conflicts
@@ -420,15 +643,15 @@ nodeRegistration:
         
         try:
             logger.info(f"Deleting cluster '{self.cluster_name}'...")
-            self._run_command(['kind', 'delete', 'cluster', '--name', self.cluster_name], timeout=120)
+            try:
+                self._run_command(['kind', 'delete', 'cluster', '--name', self.cluster_name], timeout=120)
+            finally:
+                self._cluster_list_cache = None
             logger.info("✅ Cluster deleted successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to delete cluster: {e}")
             return False
-        finally:
-            # Always restore kubeconfig
-            self._restore_kubeconfig()
     
     def quick_health_check(self) -> bool:
         """Quick health check without creating test pods"""
@@ -442,7 +665,10 @@ nodeRegistration:
             cmd = ['kubectl', 'get', 'nodes']
             if use_context:
                 cmd.extend(['--context', self.cluster_context])
-            result = self._run_command(cmd, timeout=15)
+            result = self._run_command(cmd, timeout=15, check=False)
+            if result.returncode != 0:
+                logger.error(f"❌ Quick health check failed: kubectl exited with {result.returncode}")
+                return False
             
             # Check if nodes are ready
             if 'Ready' in result.stdout:
@@ -485,30 +711,15 @@ nodeRegistration:
             self._run_command(cmd, timeout=30)
             
             # Test creating a test pod
-            test_yaml = """
-apiVersion: v1
-kind: Pod
-metadata:
-  name: cluster-test
-  namespace: default
-spec:
-  containers:
-  - name: test
-    image: busybox:1.35
-    command: ['sleep', '60']
-  restartPolicy: Never
-"""
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-                f.write(test_yaml)
-                test_file = f.name
+            if k8s_client is not None:
+                return self._verify_test_pod_api(use_context, _TEST_POD_YAML)
             
             try:
-                # Create test pod
-                cmd = ['kubectl', 'apply', '-f', test_file]
+                # Create test pod; the manifest is piped in, no temp file needed
+                cmd = ['kubectl', 'apply', '-f', '-']
                 if use_context:
                     cmd.extend(['--context', self.cluster_context])
-                self._run_command(cmd, timeout=30)
+                self._run_command(cmd, timeout=30, input=_TEST_POD_YAML)
                 
                 # Wait for pod to be ready
                 cmd = ['kubectl', 'wait', '--for=condition=Ready', 'pod/cluster-test', '--timeout=60s']
@@ -529,22 +740,19 @@ spec:
                     cmd = ['kubectl', 'delete', 'pod', 'cluster-test', '--ignore-not-found']
                     if use_context:
                         cmd.extend(['--context', self.cluster_context])
-                    self._run_command(cmd, timeout=30, check=False)
+                    self._run_command(cmd, timeout=30, check=False, log_on_failure=False)
                 except subprocess.TimeoutExpired:
                     logger.warning("Pod cleanup timed out, trying force delete...")
                     try:
                         cmd = ['kubectl', 'delete', 'pod', 'cluster-test', '--force', '--grace-period=0', '--ignore-not-found']
                         if use_context:
                             cmd.extend(['--context', self.cluster_context])
-                        self._run_command(cmd, timeout=15, check=False)
+                        self._run_command(cmd, timeout=15, check=False, log_on_failure=False)
                     except Exception:
                         logger.warning("Force delete also failed, but continuing anyway...")
                 except Exception:
                     logger.warning("Pod cleanup failed, but continuing anyway...")
                 
-                # Clean up temp file
-                os.unlink(test_file)
-                
             return verification_success
                 
         except Exception as e:
@@ -8,19 +8,96 @@ and sends periodic heartbeats to maintain liveness.
 import asyncio
 import json
 import logging
+import random
+import re
+import sys
 import time
 import threading
-from typing import Dict, Any, Optional
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import uuid
 
 import requests
-from flask import Flask, request, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, current_app, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; Flask's stdlib provider is used instead
+    orjson = None
+
+try:
+    from waitress import create_server
+except ImportError:  # waitress is optional; fall back to Flask's dev server
+    create_server = None
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A single dict lookup is atomic under the GIL, so point reads skip the data
+# lock there; free-threaded builds (PEP 703) keep locking them
+_GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+_MISSING = object()
+
+# orjson parses integers beyond 64 bits as floats, silently losing digits.
+# Every such integer contains a run of 19+ digits, so bodies with one are
+# parsed by the stdlib instead; other long digit runs only cost some speed
+_LONG_DIGIT_RUN = re.compile(rb"[0-9]{19}")
+
+# Fixed response bodies, encoded once
+MISSING_KEY_BODY = b'{"error": "Missing key"}'
+KEY_NOT_FOUND_BODY = b'{"error": "Key not found"}'
+
+
+def encode_json(obj) -> bytes:
+    """JSON-encode obj with orjson when available, else the stdlib codec"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits
+    return json.dumps(obj).encode()
+
+
+def parse_json_body():
+    """Parse the current request body with the app's JSON provider (None if
+    the body is empty), skipping get_json's content-type checks and caching"""
+    body = request.get_data(cache=False)
+    return current_app.json.loads(body) if body else None
+
+
+def json_body_response(body: bytes, status: int = 200) -> Response:
+    """Wrap an already-encoded JSON body in a response, bypassing jsonify"""
+    return Response(body, status=status, mimetype="application/json")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson.
+
+    Values orjson rejects, such as integers beyond 64 bits, fall back to the
+    stdlib codec so every payload the default provider accepts still works.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+            
+    def loads(self, s, **kwargs):
+        raw = s.encode() if isinstance(s, str) else s
+        if _LONG_DIGIT_RUN.search(raw):
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return super().loads(s, **kwargs)
+
 
 class KVStoreService:
     """Key-Value Store Service that integrates with Gateway"""
@@ -29,23 +106,46 @@ class KVStoreService:
         self.node_id = node_id
         self.listen_port = listen_port
         self.gateway_address = gateway_address
+        self.heartbeat_url = f"http://{gateway_address}/heartbeat"
         self.listen_address = "0.0.0.0"
         
-        # In-memory key-value store
-        self.data: Dict[str, Any] = {}
-        self.data_lock = threading.RLock()
+        # Every KV response ends with this node's ID; splice in the encoded form
+        self._node_id_suffix = b', "node_id": ' + encode_json(node_id) + b'}'
+        
+        # In-memory key-value store. Values are kept JSON-encoded, as they
+        # arrive once per PUT but are sent back on every GET
+        self.data: Dict[str, bytes] = {}
+        self.data_lock = threading.Lock()  # handlers never re-enter it, so no RLock
+        self.read_lock = nullcontext() if _GIL_ENABLED else self.data_lock
         
         # Configuration
         self.heartbeat_interval = 10  # seconds
-        self.registration_retry_interval = 5  # seconds
+        self.registration_retry_interval = 5  # seconds, first and shortest retry delay
+        self.registration_retry_cap = 30  # seconds
+        self.server_threads = 16  # HTTP worker threads
+        
+        # Registration and heartbeats always go to the same gateway, so keep
+        # one connection to it alive instead of reconnecting every interval.
+        # Both are idempotent, so the adapter may retry them, POST included
+        self.gateway_session = requests.Session()
+        self.gateway_session.mount("http://", HTTPAdapter(
+            pool_connections=1, pool_maxsize=2,
+            max_retries=Retry(total=3, backoff_factor=0.2, allowed_methods=None)))
         
         # Flask app for HTTP API
         self.app = Flask(__name__)
+        if orjson is not None:
+            # Route every jsonify() and request body parse through orjson
+            self.app.json = OrjsonProvider(self.app)
         self.setup_routes()
         
         # Service state
         self.running = False
         self.registered = False
+        # Heartbeats omit the address once the gateway has accepted a compact one
+        self.compact_heartbeats = False
+        self.server = None
+        self.started_at: Optional[float] = None  # time.monotonic() at start()
         
     def setup_routes(self):
         """Setup Flask routes for the KV store API"""
@@ -54,22 +154,20 @@ class KVStoreService:
         def put_key():
             """Store a key-value pair"""
             try:
-                data = request.get_json()
+                data = parse_json_body()
                 key = data.get('key')
                 value = data.get('value')
                 
                 if not key:
-                    return jsonify({"error": "Missing key"}), 400
+                    return json_body_response(MISSING_KEY_BODY, 400)
                     
+                value_json = encode_json(value)
                 with self.data_lock:
-                    self.data[key] = value
+                    self.data[key] = value_json
                     
-                logger.info(f"Stored key: {key}")
-                return jsonify({
-                    "status": "stored",
-                    "key": key,
-                    "node_id": self.node_id
-                }), 200
+                logger.debug("Stored key: %s", key)
+                return json_body_response(
+                    b'{"status": "stored", "key": ' + encode_json(key) + self._node_id_suffix)
                 
             except Exception as e:
                 logger.error(f"Error storing key: {e}")
@@ -79,15 +177,12 @@ class KVStoreService:
         def get_key(key):
             """Retrieve a value by key"""
             try:
-                with self.data_lock:
-                    if key in self.data:
-                        return jsonify({
-                            "key": key,
-                            "value": self.data[key],
-                            "node_id": self.node_id
-                        }), 200
-                    else:
-                        return jsonify({"error": "Key not found"}), 404
+                with self.read_lock:
+                    value = self.data.get(key, _MISSING)
+                if value is _MISSING:
+                    return json_body_response(KEY_NOT_FOUND_BODY, 404)
+                return json_body_response(
+                    b'{"key": ' + encode_json(key) + b', "value": ' + value + self._node_id_suffix)
                         
             except Exception as e:
                 logger.error(f"Error retrieving key: {e}")
@@ -97,21 +192,18 @@ class KVStoreService:
         def get_key_by_body():
             """Retrieve a value by key (key in POST body for special characters)"""
             try:
-                data = request.get_json()
+                data = parse_json_body()
                 key = data.get('key')
                 
                 if not key:
-                    return jsonify({"error": "Missing key"}), 400
+                    return json_body_response(MISSING_KEY_BODY, 400)
                 
-                with self.data_lock:
-                    if key in self.data:
-                        return jsonify({
-                            "key": key,
-                            "value": self.data[key],
-                            "node_id": self.node_id
-                        }), 200
-                    else:
-                        return jsonify({"error": "Key not found"}), 404
+                with self.read_lock:
+                    value = self.data.get(key, _MISSING)
+                if value is _MISSING:
+                    return json_body_response(KEY_NOT_FOUND_BODY, 404)
+                return json_body_response(
+                    b'{"key": ' + encode_json(key) + b', "value": ' + value + self._node_id_suffix)
                         
             except Exception as e:
                 logger.error(f"Error retrieving key: {e}")
@@ -122,15 +214,11 @@ class KVStoreService:
             """Delete a key-value pair"""
             try:
                 with self.data_lock:
-                    if key in self.data:
-                        del self.data[key]
-                        return jsonify({
-                            "status": "deleted",
-                            "key": key,
-                            "node_id": self.node_id
-                        }), 200
-                    else:
-                        return jsonify({"error": "Key not found"}), 404
+                    found = self.data.pop(key, _MISSING) is not _MISSING
+                if not found:
+                    return json_body_response(KEY_NOT_FOUND_BODY, 404)
+                return json_body_response(
+                    b'{"status": "deleted", "key": ' + encode_json(key) + self._node_id_suffix)
                         
             except Exception as e:
                 logger.error(f"Error deleting key: {e}")
@@ -140,27 +228,75 @@ class KVStoreService:
         def delete_key_by_body():
             """Delete a key-value pair (key in POST body for special characters)"""
             try:
-                data = request.get_json()
+                data = parse_json_body()
                 key = data.get('key')
                 
                 if not key:
-                    return jsonify({"error": "Missing key"}), 400
+                    return json_body_response(MISSING_KEY_BODY, 400)
                 
                 with self.data_lock:
-                    if key in self.data:
-                        del self.data[key]
-                        return jsonify({
-                            "status": "deleted",
-                            "key": key,
-                            "node_id": self.node_id
-                        }), 200
-                    else:
-                        return jsonify({"error": "Key not found"}), 404
+                    found = self.data.pop(key, _MISSING) is not _MISSING
+                if not found:
+                    return json_body_response(KEY_NOT_FOUND_BODY, 404)
+                return json_body_response(
+                    b'{"status": "deleted", "key": ' + encode_json(key) + self._node_id_suffix)
                         
             except Exception as e:
                 logger.error(f"Error deleting key: {e}")
                 return jsonify({"error": str(e)}), 500
         
+        @self.app.route('/bulk', methods=['POST'])
+        def bulk_operations():
+            """Apply a batch of put/get/delete operations in order in one request"""
+            try:
+                data = parse_json_body()
+                ops = data.get('ops') if isinstance(data, dict) else None
+                
+                if not isinstance(ops, list):
+                    return jsonify({"error": "Missing ops list"}), 400
+                
+                # Each result is paired with the stored JSON of a value it
+                # returns, which is spliced in after the lock is released
+                results = []
+                with self.data_lock:
+                    for op in ops:
+                        if not isinstance(op, dict):
+                            results.append(({"op": None, "error": "Invalid op"}, None))
+                            continue
+                        kind = op.get('op')
+                        key = op.get('key')
+                        
+                        if not key:
+                            results.append(({"op": kind, "error": "Missing key"}, None))
+                        elif not isinstance(key, str):
+                            results.append(({"op": kind, "error": "Invalid key"}, None))
+                        elif kind == 'put':
+                            self.data[key] = encode_json(op.get('value'))
+                            results.append(({"op": kind, "key": key, "status": "stored"}, None))
+                        elif kind == 'get':
+                            value = self.data.get(key)
+                            if value is not None:
+                                results.append(({"op": kind, "key": key}, value))
+                            else:
+                                results.append(({"op": kind, "key": key, "error": "Key not found"}, None))
+                        elif kind == 'delete':
+                            if self.data.pop(key, None) is not None:
+                                results.append(({"op": kind, "key": key, "status": "deleted"}, None))
+                            else:
+                                results.append(({"op": kind, "key": key, "error": "Key not found"}, None))
+                        else:
+                            results.append(({"op": kind, "key": key, "error": "Unknown op"}, None))
+                
+                parts = [encode_json(result) if value is None
+                         else encode_json(result)[:-1] + b', "value": ' + value + b'}'
+                         for result, value in results]
+                return json_body_response(
+                    b'{"results": [' + b', '.join(parts) + b']' + self._node_id_suffix)
+                
+            except Exception as e:
+                logger.error(f"Error applying bulk operations: {e}")
+                return jsonify({"error": str(e)}), 500
+        
         @self.app.route('/keys', methods=['GET'])
         def list_keys():
             """List all keys in this store"""
@@ -203,15 +339,16 @@ class KVStoreService:
         @self.app.route('/stats', methods=['GET'])
         def get_stats():
             """Get node statistics"""
-            with self.data_lock:
-                return jsonify({
-                    "node_id": self.node_id,
-                    "address": f"{self.listen_address}:{self.listen_port}",
-                    "key_count": len(self.data),
-                    "registered": self.registered,
-                    "gateway": self.gateway_address,
-                    "uptime": time.time() - self.start_time if hasattr(self, 'start_time') else 0
-                }), 200
+            # len() of a dict is a single atomic read, so like /health this
+            # never waits on data_lock
+            return jsonify({
+                "node_id": self.node_id,
+                "address": f"{self.listen_address}:{self.listen_port}",
+                "key_count": len(self.data),
+                "registered": self.registered,
+                "gateway": self.gateway_address,
+                "uptime": time.monotonic() - self.started_at if self.started_at is not None else 0
+            }), 200
     
     def _register_with_gateway(self) -> bool:
         """Register this KV store with the gateway"""
@@ -222,8 +359,8 @@ class KVStoreService:
                 "port": self.listen_port
             }
             
-            response = requests.post(
-                f"http://{self.gateway_address}/heartbeat",
+            response = self.gateway_session.post(
+                self.heartbeat_url,
                 json=heartbeat_data,
                 timeout=10
             )
@@ -231,6 +368,7 @@ class KVStoreService:
             if response.status_code == 200:
                 logger.info(f"Successfully registered with gateway {self.gateway_address}")
                 self.registered = True
+                self.compact_heartbeats = False
                 return True
             else:
                 logger.error(f"Registration failed: {response.status_code} - {response.text}")
@@ -243,23 +381,34 @@ class KVStoreService:
     def _send_heartbeat(self) -> bool:
         """Send heartbeat to gateway"""
         try:
+            # Once the gateway knows this node only the changing fields are
+            # sent. A gateway may still be adding a just-registered node (the
+            # Raft gateway applies adds asynchronously), so full heartbeats
+            # continue until a compact one is accepted
+            compact = self.compact_heartbeats
             heartbeat_data = {
                 "node_id": self.node_id,
-                "address": self.listen_address,
-                "port": self.listen_port,
                 "timestamp": time.time(),
                 "key_count": len(self.data)
             }
+            if not compact:
+                heartbeat_data["address"] = self.listen_address
+                heartbeat_data["port"] = self.listen_port
             
-            response = requests.post(
-                f"http://{self.gateway_address}/heartbeat",
+            response = self.gateway_session.post(
+                self.heartbeat_url,
                 json=heartbeat_data,
                 timeout=5
             )
             
             if response.status_code == 200:
-                logger.debug(f"Heartbeat sent successfully")
+                logger.debug("Heartbeat sent successfully")
+                self.compact_heartbeats = True
                 return True
+            elif compact and response.status_code == 400:
+                # The gateway doesn't know this node (yet); resend in full
+                self.compact_heartbeats = False
+                return self._send_heartbeat()
             else:
                 logger.warning(f"Heartbeat failed: {response.status_code}")
                 return False
@@ -268,16 +417,25 @@ class KVStoreService:
             logger.warning(f"Failed to send heartbeat: {e}")
             return False
     
+    def _next_retry_delay(self, delay: float) -> float:
+        """Decorrelated jitter: grow the delay randomly so nodes that lost the
+        gateway together don't all retry at the same moments"""
+        return min(self.registration_retry_cap,
+                   random.uniform(self.registration_retry_interval, delay * 3))
+    
     def _heartbeat_loop(self):
         """Background task to send periodic heartbeats"""
+        retry_delay = self.registration_retry_interval
         while self.running:
             try:
                 if not self.registered:
                     # Try to register first
                     if self._register_with_gateway():
                         self.registered = True
+                        retry_delay = self.registration_retry_interval
                     else:
-                        time.sleep(self.registration_retry_interval)
+                        retry_delay = self._next_retry_delay(retry_delay)
+                        time.sleep(retry_delay)
                         continue
                 
                 # Send heartbeat
@@ -295,7 +453,7 @@ class KVStoreService:
     def start(self):
         """Start the KV store service"""
         self.running = True
-        self.start_time = time.time()
+        self.started_at = time.monotonic()
         
         # Start heartbeat thread
         heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
@@ -304,14 +462,27 @@ class KVStoreService:
         logger.info(f"Starting KV Store Service {self.node_id} on port {self.listen_port}")
         logger.info(f"Will register with gateway at {self.gateway_address}")
         
-        # Start Flask app
-        self.app.run(host=self.listen_address, port=self.listen_port, threaded=True)
+        # Serve the Flask app with waitress's thread pool when available; the
+        # development server spawns a new thread per request
+        if create_server is None:
+            self.app.run(host=self.listen_address, port=self.listen_port, threaded=True)
+            return
+        self.server = create_server(self.app, host=self.listen_address, port=self.listen_port,
+                                    threads=self.server_threads)
+        self.server.run()
         
     def stop(self):
         """Stop the KV store service"""
         self.running = False
         self.registered = False
         self._explicitly_stopped = True  # Mark as explicitly stopped for health checks
+        self.gateway_session.close()
+        
+        if self.server is not None:
+            self.server.close()
+            self.server.task_dispatcher.shutdown()
+            logger.info("KV Store service stopped")
+            return
         
         # Try to shutdown Flask server gracefully
         try:
@@ -327,25 +498,134 @@ class KVStoreService:
 class KVStoreClient:
     """Client for interacting with KV store nodes"""
     
-    def __init__(self, gateway_address: str):
+    def __init__(self, gateway_address: str, pool_size: int = 16):
         self.gateway_address = gateway_address
+        self._gateway_nodes_url = f"http://{gateway_address}/nodes/"
+        self._gateway_lookup_url = f"http://{gateway_address}/nodes/lookup"
+        
+        # One keep-alive session for the gateway and every node it routes to
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        
+        # Recently resolved keys map straight to their node's base URL until it
+        # expires, saving the gateway round trip; a failed node call drops it
+        self.node_cache_ttl = 5.0  # seconds
+        self.node_cache_size = 65536
+        self._node_cache: Dict[str, Tuple[float, str]] = {}
+        
+        # Multi-key operations send one /bulk request per node in parallel
+        self.bulk_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="kv-bulk")
+        
+    def close(self):
+        """Close the pooled connections"""
+        self.bulk_executor.shutdown(wait=False)
+        self.session.close()
+    
+    def _node_url(self, key: str) -> Optional[str]:
+        """Base URL of the node responsible for a key, asking the gateway only
+        when there is no fresh cached answer"""
+        now = time.monotonic()
+        cached = self._node_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        response = self.session.get(self._gateway_nodes_url + key)
+        if response.status_code != 200:
+            logger.error(f"Failed to get node for key {key}")
+            return None
+            
+        node_info = response.json()["node"]
+        node_url = f"http://{node_info['address']}:{node_info['port']}"
+        if len(self._node_cache) >= self.node_cache_size:
+            self._node_cache.clear()
+        self._node_cache[key] = (now + self.node_cache_ttl, node_url)
+        return node_url
+    
+    def _node_urls(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Node base URLs for many keys, resolving the uncached ones in a single
+        gateway round trip"""
+        now = time.monotonic()
+        node_urls: Dict[str, Optional[str]] = {}
+        missing = []
+        for key in keys:
+            cached = self._node_cache.get(key)
+            if cached is not None and cached[0] > now:
+                node_urls[key] = cached[1]
+            else:
+                missing.append(key)
+        if not missing:
+            return node_urls
+        
+        response = self.session.post(self._gateway_lookup_url, json={"keys": missing}, timeout=5)
+        mapping = response.json()["mapping"] if response.status_code == 200 else {}
+        if len(self._node_cache) + len(missing) > self.node_cache_size:
+            self._node_cache.clear()
+        for key in missing:
+            node_info = mapping.get(key)
+            if node_info is None:
+                logger.error(f"Failed to get node for key {key}")
+                node_urls[key] = None
+                continue
+            node_url = f"http://{node_info['address']}:{node_info['port']}"
+            self._node_cache[key] = (now + self.node_cache_ttl, node_url)
+            node_urls[key] = node_url
+        return node_urls
+    
+    def _bulk(self, ops: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Apply ops with one /bulk request per responsible node, sent
+        concurrently; an op's result is None if its node couldn't be reached"""
+        node_urls = self._node_urls(op["key"] for op in ops)
+        groups: Dict[str, List[int]] = {}
+        for i, op in enumerate(ops):
+            node_url = node_urls.get(op["key"])
+            if node_url is not None:
+                groups.setdefault(node_url, []).append(i)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ops)
+        
+        def send(node_url: str, indexes: List[int]):
+            try:
+                response = self.session.post(
+                    node_url + "/bulk",
+                    json={"ops": [ops[i] for i in indexes]},
+                    timeout=5
+                )
+                if response.status_code == 200:
+                    for i, result in zip(indexes, response.json()["results"]):
+                        results[i] = result
+                    return
+                logger.error(f"Bulk request to {node_url} failed: {response.status_code}")
+            except Exception as e:
+                logger.error(f"Bulk request to {node_url} failed: {e}")
+            for i in indexes:
+                self._node_cache.pop(ops[i]["key"], None)
+        
+        list(self.bulk_executor.map(send, groups.keys(), groups.values()))
+        return results
         
     def put(self, key: str, value: Any) -> bool:
         """Store a key-value pair using consistent hashing"""
         try:
-            # Get the responsible node from gateway
-            response = requests.get(f"http://{self.gateway_address}/nodes/{key}")
-            if response.status_code != 200:
-                logger.error(f"Failed to get node for key {key}")
+            value_json = json.dumps(value).encode()
+        except (TypeError, ValueError) as e:
+            logger.error(f"Failed to put key {key}: {e}")
+            return False
+        return self.put_raw(key, value_json)
+    
+    def put_raw(self, key: str, value_json: bytes) -> bool:
+        """Store a value that has already been JSON-encoded, skipping re-serialization"""
+        try:
+            # Get the responsible node from gateway (or the cache)
+            node_url = self._node_url(key)
+            if node_url is None:
                 return False
-                
-            node_info = response.json()["node"]
-            node_address = f"{node_info['address']}:{node_info['port']}"
             
-            # Store the key-value pair in the responsible node
-            store_response = requests.post(
-                f"http://{node_address}/put",
-                json={"key": key, "value": value},
+            # Splice the pre-encoded value into the request body
+            body = b'{"key": ' + json.dumps(key).encode() + b', "value": ' + value_json + b'}'
+            store_response = self.session.post(
+                node_url + "/put",
+                data=body,
+                headers={"Content-Type": "application/json"},
                 timeout=5
             )
             
@@ -353,39 +633,36 @@ class KVStoreClient:
             
         except Exception as e:
             logger.error(f"Failed to put key {key}: {e}")
+            self._node_cache.pop(key, None)
             return False
     
     def get(self, key: str) -> Optional[Any]:
         """Retrieve a value by key using consistent hashing"""
         try:
-            # Get the responsible node from gateway
-            response = requests.get(f"http://{self.gateway_address}/nodes/{key}")
-            if response.status_code != 200:
-                logger.error(f"Failed to get node for key {key}")
+            # Get the responsible node from gateway (or the cache)
+            node_url = self._node_url(key)
+            if node_url is None:
                 return None
-                
-            node_info = response.json()["node"]
-            node_address = f"{node_info['address']}:{node_info['port']}"
             
             # Try POST method first (handles special characters)
             try:
-                get_response = requests.post(
-                    f"http://{node_address}/get",
+                get_response = self.session.post(
+                    node_url + "/get",
                     json={"key": key},
                     timeout=5
                 )
                 if get_response.status_code == 200:
                     return get_response.json()["value"]
             except:
-                pass
+                self._node_cache.pop(key, None)
             
             # Fallback to GET method (for backward compatibility)
             try:
-                get_response = requests.get(f"http://{node_address}/get/{key}", timeout=5)
+                get_response = self.session.get(node_url + "/get/" + key, timeout=5)
                 if get_response.status_code == 200:
                     return get_response.json()["value"]
             except:
-                pass
+                self._node_cache.pop(key, None)
                 
             return None
                 
@@ -393,35 +670,65 @@ class KVStoreClient:
             logger.error(f"Failed to get key {key}: {e}")
             return None
     
+    def put_many(self, items: Dict[str, Any]) -> Dict[str, bool]:
+        """Store many key-value pairs, one request per responsible node"""
+        try:
+            ops = [{"op": "put", "key": key, "value": value} for key, value in items.items()]
+            results = self._bulk(ops)
+        except Exception as e:
+            logger.error(f"Failed to put keys: {e}")
+            return dict.fromkeys(items, False)
+        return {op["key"]: result is not None and result.get("status") == "stored"
+                for op, result in zip(ops, results)}
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """Retrieve many values (None for missing keys), one request per node"""
+        ops = [{"op": "get", "key": key} for key in dict.fromkeys(keys)]
+        try:
+            results = self._bulk(ops)
+        except Exception as e:
+            logger.error(f"Failed to get keys: {e}")
+            return {op["key"]: None for op in ops}
+        return {op["key"]: result.get("value") if result is not None else None
+                for op, result in zip(ops, results)}
+    
+    def delete_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """Delete many keys, one request per responsible node"""
+        ops = [{"op": "delete", "key": key} for key in dict.fromkeys(keys)]
+        try:
+            results = self._bulk(ops)
+        except Exception as e:
+            logger.error(f"Failed to delete keys: {e}")
+            return {op["key"]: False for op in ops}
+        return {op["key"]: result is not None and result.get("status") == "deleted"
+                for op, result in zip(ops, results)}
+    
     def delete(self, key: str) -> bool:
         """Delete a key using consistent hashing"""
         try:
-            # Get the responsible node from gateway
-            response = requests.get(f"http://{self.gateway_address}/nodes/{key}")
-            if response.status_code != 200:
-                logger.error(f"Failed to get node for key {key}")
+            # Get the responsible node from gateway (or the cache)
+            node_url = self._node_url(key)
+            if node_url is None:
                 return False
-                
-            node_info = response.json()["node"]
-            node_address = f"{node_info['address']}:{node_info['port']}"
             
             # Try POST method first (handles special characters)
             try:
-                delete_response = requests.post(
-                    f"http://{node_address}/delete",
+                delete_response = self.session.post(
+                    node_url + "/delete",
                     json={"key": key},
                     timeout=5
                 )
                 if delete_response.status_code == 200:
                     return True
             except:
-                pass
+                self._node_cache.pop(key, None)
             
             # Fallback to DELETE method (for backward compatibility)
             try:
-                delete_response = requests.delete(f"http://{node_address}/delete/{key}", timeout=5)
+                delete_response = self.session.delete(node_url + "/delete/" + key, timeout=5)
                 return delete_response.status_code == 200
             except:
+                self._node_cache.pop(key, None)
                 return False
             
         except Exception as e:
@@ -0,0 +1,73 @@
+"""
+Unit tests for RotatingBloomFilter
+"""
+
+import uuid
+from gateway.bloom_filter import RotatingBloomFilter
+
+
+class TestRotatingBloomFilter:
+    """Test cases for RotatingBloomFilter class"""
+
+    def test_sizing(self):
+        """Test that bit and hash counts follow the requested capacity"""
+        bloom = RotatingBloomFilter(capacity=1000, error_rate=0.01)
+
+        assert bloom.num_bits >= 9000  # ~9.6 bits per item at 1% FPR
+        assert bloom.num_hashes == 7
+        assert len(bloom.current) == (bloom.num_bits + 7) // 8
+
+    def test_add_reports_duplicates(self):
+        """Test that add() returns True only for items already seen"""
+        bloom = RotatingBloomFilter(capacity=100)
+
+        assert bloom.add("message-1") == False
+        assert bloom.add("message-1") == True
+        assert "message-1" in bloom
+        assert bloom.count == 1
+
+    def test_str_and_bytes_are_equivalent(self):
+        """Test that a str and its UTF-8 bytes map to the same entry"""
+        bloom = RotatingBloomFilter(capacity=100)
+
+        bloom.add("message-1")
+        assert b"message-1" in bloom
+
+    def test_no_false_negatives(self):
+        """Test that every added item is reported as present"""
+        bloom = RotatingBloomFilter(capacity=5000)
+        ids = [str(uuid.uuid4()) for _ in range(5000)]
+
+        for message_id in ids:
+            bloom.add(message_id)
+
+        assert all(message_id in bloom for message_id in ids)
+
+    def test_false_positive_rate(self):
+        """Test that unseen items are rarely reported as present"""
+        bloom = RotatingBloomFilter(capacity=5000, error_rate=0.01)
+        for _ in range(5000):
+            bloom.add(str(uuid.uuid4()))
+
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(5000))
+
+        assert false_positives / 5000 < 0.03
+
+    def test_rotation_forgets_oldest_generation(self):
+        """Test that IDs survive one rotation and are dropped after two"""
+        bloom = RotatingBloomFilter(capacity=1000)
+
+        bloom.add("oldest")
+        for i in range(999):
+            bloom.add(f"first-{i}")
+
+        # Filling the next generation retires the first one to "previous"
+        for i in range(1000):
+            bloom.add(f"second-{i}")
+        assert "oldest" in bloom
+
+        # Once "previous" is replaced, the oldest IDs are forgotten
+        for i in range(1000):
+            bloom.add(f"third-{i}")
+        assert "oldest" not in bloom
+        assert "third-0" in bloom
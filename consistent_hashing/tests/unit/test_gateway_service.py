@@ -7,7 +7,11 @@ import time
 import json
 import threading
 from unittest.mock import Mock, patch, MagicMock
-from gateway.gateway_service_simple import SimpleGatewayService, NodeInfo, GossipMessage
+from gateway import gateway_service_simple
+from gateway.gateway_service_simple import (
+    SimpleGatewayService, NodeInfo, GossipMessage, STATUS_ACTIVE, STATUS_INACTIVE, STATUS_DEAD
+)
+from gateway.simple_hash_ring import SimpleHashRing
 
 
 class TestNodeInfo:
@@ -20,7 +24,7 @@ class TestNodeInfo:
         assert node.node_id == "node1"
         assert node.address == "127.0.0.1"
         assert node.port == 8080
-        assert node.status == "active"
+        assert node.status == STATUS_ACTIVE
         assert isinstance(node.last_heartbeat, float)
     
     def test_node_info_to_dict(self):
@@ -51,7 +55,9 @@ class TestNodeInfo:
         assert node.address == "192.168.1.100"
         assert node.port == 9090
         assert node.last_heartbeat == 1234567890.0
-        assert node.status == "inactive"
+        assert node.status == STATUS_INACTIVE
+        # The status name round-trips through to_dict
+        assert node.to_dict()["status"] == "inactive"
 
 
 class TestGossipMessage:
@@ -68,6 +74,13 @@ class TestGossipMessage:
         assert isinstance(msg.message_id, str)
         assert isinstance(msg.timestamp, float)
     
+    def test_gossip_message_ids_are_unique(self):
+        """Test that message IDs are distinct and carry the sender ID"""
+        ids = {GossipMessage("HEARTBEAT", "gateway1", {}).message_id for _ in range(1000)}
+        
+        assert len(ids) == 1000
+        assert all(message_id.startswith("gateway1:") for message_id in ids)
+    
     def test_gossip_message_to_dict(self):
         """Test converting GossipMessage to dictionary"""
         data = {"test": "data"}
@@ -178,6 +191,25 @@ class TestSimpleGatewayService:
         assert "node1" not in service.nodes
         assert "node1" not in service.hash_ring.nodes
     
+    def test_key_lookup_cache_follows_ring_changes(self):
+        """Test that cached key lookups are dropped when the ring changes"""
+        service = SimpleGatewayService("gateway1", 8000)
+        service._add_node_to_ring({
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": time.time(),
+            "status": "active"
+        })
+        
+        assert service.lookup_node("key") == "node1"
+        assert service.lookup_node("key") == "node1"
+        assert service.lookup_node.cache_info().hits == 1
+        
+        service._remove_node_from_ring("node1")
+        assert service.lookup_node.cache_info().currsize == 0
+        assert service.lookup_node("key") is None
+    
     def test_remove_nonexistent_node_from_ring(self):
         """Test removing a node that doesn't exist"""
         service = SimpleGatewayService("gateway1", 8000)
@@ -209,6 +241,153 @@ class TestSimpleGatewayService:
             # Verify gossip was called
             mock_gossip.assert_called_once_with("node1", "127.0.0.1", 8080)
     
+    def test_duplicate_gossip_is_ignored(self):
+        """Test that a gossip message is processed only once"""
+        service = SimpleGatewayService("gateway1", 8000)
+        service._add_node_to_ring({
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": 1000.0,
+            "status": "active"
+        })
+        
+        message = GossipMessage("HEARTBEAT", "gateway2", {
+            "node_id": "node1", "address": "127.0.0.1", "port": 8080, "timestamp": 2000.0
+        })
+        service._process_gossip_message(message)
+        assert service.nodes["node1"].last_heartbeat == 2000.0
+        
+        # Replaying the same message must not apply it again
+        service.nodes["node1"].last_heartbeat = 1000.0
+        service._process_gossip_message(message)
+        assert service.nodes["node1"].last_heartbeat == 1000.0
+        # Only the first delivery is counted
+        assert service.gossip_received == {"HEARTBEAT": 1}
+    
+    def test_gossip_is_batched_per_peer(self):
+        """Test that queued gossip is sent to each peer as a single batch"""
+        service = SimpleGatewayService("gateway1", 8000, ["peer1:8000", "peer2:8000"])
+        service.gossip_executor = Mock()
+        
+        for i in range(3):
+            service._gossip_heartbeat(f"node{i}", "127.0.0.1", 8080 + i)
+        assert service.gossip_outbox.qsize() == 3
+        
+        batch = [service.gossip_outbox.get_nowait() for _ in range(3)]
+        service._flush_gossip_batch(batch)
+        
+        # One submission per peer, each carrying the whole batch
+        assert service.gossip_executor.submit.call_count == 2
+        peers = [c.args[1] for c in service.gossip_executor.submit.call_args_list]
+        assert sorted(peers) == ["peer1:8000", "peer2:8000"]
+        encoded = service.gossip_executor.submit.call_args.args[2]
+        if gateway_service_simple.msgpack is not None:
+            body = gateway_service_simple.msgpack.unpackb(encoded)
+        else:
+            body = json.loads(encoded)
+        assert [m["data"]["node_id"] for m in body["batch"]] == ["node0", "node1", "node2"]
+    
+    def test_gossip_batch_keeps_latest_heartbeat_per_node(self):
+        """Test that repeated heartbeats for a node within a batch are coalesced"""
+        service = SimpleGatewayService("gateway1", 8000, ["peer1:8000"])
+        service.gossip_executor = Mock()
+        
+        for node_id in ("node1", "node2", "node1"):
+            service._gossip_heartbeat(node_id, "127.0.0.1", 8080)
+        batch = [service.gossip_outbox.get_nowait() for _ in range(3)]
+        service._flush_gossip_batch(batch)
+        
+        encoded = service.gossip_executor.submit.call_args.args[2]
+        if gateway_service_simple.msgpack is not None:
+            body = gateway_service_simple.msgpack.unpackb(encoded)
+        else:
+            body = json.loads(encoded)
+        assert [m["message_id"] for m in body["batch"]] == [batch[2].message_id, batch[1].message_id]
+    
+    def test_gossip_fanout_limits_peers(self):
+        """Test that each batch goes to at most gossip_fanout distinct peers"""
+        peers = [f"peer{i}:8000" for i in range(10)]
+        service = SimpleGatewayService("gateway1", 8000, peers)
+        service.gossip_executor = Mock()
+        
+        service._gossip_heartbeat("node1", "127.0.0.1", 8080)
+        service._flush_gossip_batch([service.gossip_outbox.get_nowait()])
+        
+        targets = [c.args[1] for c in service.gossip_executor.submit.call_args_list]
+        assert len(targets) == service.gossip_fanout == 3
+        assert len(set(targets)) == 3
+        assert set(targets) <= set(peers)
+    
+    def test_received_gossip_not_forwarded(self):
+        """Test that received gossip is not rebroadcast to peers"""
+        service = SimpleGatewayService("gateway1", 8000, ["peer1:8000"])
+        
+        message = GossipMessage("HEARTBEAT", "gateway2", {"node_id": "node1"})
+        service._process_gossip_message(message)
+        assert service.gossip_outbox.empty()
+    
+    def test_digest_endpoints(self):
+        """Test the digest summary and the entry fetch endpoints"""
+        service = SimpleGatewayService("gateway1", 8000)
+        service._add_node_to_ring({"node_id": "node1", "address": "127.0.0.1", "port": 8080,
+                                   "last_heartbeat": time.time(), "status": "active"})
+        heartbeat = service.nodes["node1"].last_heartbeat
+        
+        with service.app.test_client() as client:
+            response = client.get('/digest')
+            assert response.status_code == 200
+            assert json.loads(response.data) == {"node1": int(heartbeat)}
+            
+            response = client.post('/digest/entries', json={"node_ids": ["node1", "unknown"]})
+            assert response.status_code == 200
+            nodes = json.loads(response.data)["nodes"]
+            assert [n["node_id"] for n in nodes] == ["node1"]
+            
+            response = client.post('/digest/entries', json={})
+            assert response.status_code == 400
+    
+    def test_sync_with_peer_fetches_only_stale_entries(self):
+        """Test that digest sync pulls newer and unknown nodes from a peer"""
+        service = SimpleGatewayService("gateway1", 8000, ["peer1:8000"])
+        service._add_node_to_ring({"node_id": "node1", "address": "127.0.0.1", "port": 8080,
+                                   "last_heartbeat": time.time(), "status": "active"})
+        service._add_node_to_ring({"node_id": "node2", "address": "127.0.0.1", "port": 8081,
+                                   "last_heartbeat": time.time(), "status": "active"})
+        now = time.time()
+        service.nodes["node1"].last_heartbeat = now - 20
+        service.nodes["node2"].last_heartbeat = now
+        
+        entries = [
+            {"node_id": "node1", "address": "127.0.0.1", "port": 8080,
+             "last_heartbeat": now, "status": "active"},
+            {"node_id": "node3", "address": "127.0.0.1", "port": 8082,
+             "last_heartbeat": now, "status": "active"},
+            {"node_id": "node4", "address": "127.0.0.1", "port": 8083,
+             "last_heartbeat": now - 3600, "status": "active"},
+        ]
+        service.gossip_session = Mock()
+        service.gossip_session.get.return_value = Mock(content=json.dumps(
+            {"node1": int(now), "node2": int(now), "node3": int(now), "node4": int(now - 3600)}).encode())
+        service.gossip_session.post.return_value = Mock(content=json.dumps({"nodes": entries}).encode())
+        
+        service._sync_with_peer("peer1:8000")
+        
+        requested = json.loads(service.gossip_session.post.call_args.kwargs["data"])["node_ids"]
+        assert sorted(requested) == ["node1", "node3", "node4"]
+        assert service.nodes["node1"].last_heartbeat == now
+        assert "node3" in service.nodes
+        # Entries the peer still holds for long-silent nodes are not revived
+        assert "node4" not in service.nodes
+    
+    def test_gossip_not_queued_without_peers(self):
+        """Test that gossip is dropped when there are no peer gateways"""
+        service = SimpleGatewayService("gateway1", 8000)
+        
+        service._gossip_heartbeat("node1", "127.0.0.1", 8080)
+        
+        assert service.gossip_outbox.empty()
+    
     def test_health_check_removes_dead_nodes(self):
         """Test that health check removes nodes that haven't sent heartbeats"""
         service = SimpleGatewayService("gateway1", 8000)
@@ -229,9 +408,126 @@ class TestSimpleGatewayService:
         
         # Node should be marked as dead or removed
         if "node1" in service.nodes:
-            assert service.nodes["node1"].status == "dead"
+            assert service.nodes["node1"].status == STATUS_DEAD
         # Note: In simplified version, nodes might not be auto-removed
     
+    def test_health_check_pings_without_holding_lock(self):
+        """Test that nodes are pinged outside the node lock"""
+        service = SimpleGatewayService("gateway1", 8000)
+        for node_id, port in (("node1", 8080), ("node2", 8081)):
+            service._add_node_to_ring({
+                "node_id": node_id,
+                "address": "127.0.0.1",
+                "port": port,
+                "last_heartbeat": time.time(),
+                "status": "active"
+            })
+        
+        def ping(url, timeout):
+            return Mock(status_code=503 if ":8081/" in url else 200)
+        
+        with patch.object(service.health_session, 'get', side_effect=ping) as mock_get:
+            service._check_node_health()
+        
+        assert mock_get.call_count == 2
+        # The node that answered 503 is removed from the ring
+        assert list(service.nodes) == ["node1"]
+        assert service.hash_ring.nodes == {"node1"}
+    
+    def test_health_check_keeps_version_when_nothing_changes(self):
+        """Test that a check where every node stays healthy keeps the caches"""
+        service = SimpleGatewayService("gateway1", 8000)
+        service._add_node_to_ring({
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": time.time(),
+            "status": "active"
+        })
+        version = service.nodes_version
+        
+        with patch.object(service.health_session, 'get', return_value=Mock(status_code=200)):
+            service._check_node_health()
+        assert service.nodes_version == version
+        
+        # A failed ping is a status change and invalidates them
+        with patch.object(service.health_session, 'get', return_value=Mock(status_code=503)):
+            service._check_node_health()
+        assert service.nodes_version > version
+    
+    def test_health_check_pings_nodes_concurrently(self):
+        """Test that nodes are pinged in parallel rather than one after another"""
+        service = SimpleGatewayService("gateway1", 8000)
+        for node_id, port in (("node1", 8080), ("node2", 8081)):
+            service._add_node_to_ring({
+                "node_id": node_id,
+                "address": "127.0.0.1",
+                "port": port,
+                "last_heartbeat": time.time(),
+                "status": "active"
+            })
+        # Both pings must be in flight at once for the barrier to open
+        barrier = threading.Barrier(2, timeout=2)
+        
+        def ping(url, timeout):
+            barrier.wait()
+            return Mock(status_code=200)
+        
+        with patch.object(service.health_session, 'get', side_effect=ping):
+            service._check_node_health()
+        
+        assert set(service.nodes) == {"node1", "node2"}
+    
+    def test_health_check_releases_lock_while_pinging(self):
+        """Test that another thread can take the node lock during a ping"""
+        service = SimpleGatewayService("gateway1", 8000)
+        service._add_node_to_ring({
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": time.time(),
+            "status": "active"
+        })
+        lock_free = []
+        
+        def ping(url, timeout):
+            lock = service.node_lock
+            worker = threading.Thread(
+                target=lambda: lock_free.append(lock.acquire(timeout=1)) or lock.release())
+            worker.start()
+            worker.join()
+            return Mock(status_code=200)
+        
+        with patch.object(service.health_session, 'get', side_effect=ping):
+            service._check_node_health()
+        
+        assert lock_free == [True]
+    
+    def test_health_check_loop_keeps_fixed_cadence(self):
+        """Test that a slow check does not push back later wakeups"""
+        service = SimpleGatewayService("gateway1", 8000)
+        service.running = True
+        service.health_check_interval = 10
+        clock = [100.0]
+        sleeps = []
+        
+        def check():
+            clock[0] += 3  # Each check takes 3 of the 10 seconds
+        
+        def sleep(delay):
+            sleeps.append(delay)
+            clock[0] += delay
+            if len(sleeps) == 2:
+                service.running = False
+        
+        service._check_node_health = check
+        with patch('gateway.gateway_service_simple.prioritize_current_thread'), \
+             patch('gateway.gateway_service_simple.time.monotonic', side_effect=lambda: clock[0]), \
+             patch('gateway.gateway_service_simple.time.sleep', side_effect=sleep):
+            service._health_check_loop()
+        
+        assert sleeps == [7, 7]
+    
     def test_flask_app_routes_exist(self):
         """Test that required Flask routes are set up"""
         service = SimpleGatewayService("gateway1", 8000)
@@ -348,12 +644,28 @@ class TestGatewayServiceIntegration:
             )
             assert response.status_code == 400
             
-            # Missing address
+            # Missing address for a node the gateway doesn't know
             response = client.post('/heartbeat',
                 json={"node_id": "node1", "port": 8080}
             )
             assert response.status_code == 400
     
+    def test_heartbeat_endpoint_compact_heartbeat(self, mock_service):
+        """Test that a registered node may omit its address from heartbeats"""
+        with mock_service.app.test_client() as client:
+            client.post('/heartbeat',
+                json={"node_id": "node1", "address": "10.0.0.1", "port": 9090}
+            )
+            mock_service.nodes["node1"].last_heartbeat = time.time() - 10
+            
+            with patch.object(mock_service, '_gossip_heartbeat') as mock_gossip:
+                response = client.post('/heartbeat', json={"node_id": "node1"})
+            
+            assert response.status_code == 200
+            assert mock_service.nodes["node1"].last_heartbeat > time.time() - 5
+            # Peers still learn the full address through gossip
+            mock_gossip.assert_called_once_with("node1", "10.0.0.1", 9090)
+    
     def test_get_nodes_endpoint(self, mock_service):
         """Test the get nodes endpoint"""
         # Add some nodes
@@ -382,6 +694,86 @@ class TestGatewayServiceIntegration:
                 assert "status" in node_data
                 assert "last_heartbeat" in node_data
     
+    def test_get_nodes_cache_invalidation(self, mock_service):
+        """Test that /nodes is served from cache until the node table changes"""
+        node_data = {
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": 1000.0,
+            "status": "active"
+        }
+        mock_service._add_node_to_ring(node_data)
+        
+        with mock_service.app.test_client() as client:
+            first = client.get('/nodes').get_data()
+            version = mock_service.nodes_version
+            assert mock_service.nodes_json_cache == (version, first)
+            # Cache hits are served without touching the node lock
+            with patch.object(mock_service.node_lock, 'acquire_read', side_effect=AssertionError):
+                assert client.get('/nodes').get_data() == first
+            
+            # A heartbeat within the same second keeps the cached body
+            mock_service._record_heartbeat(mock_service.nodes["node1"], 1000.5)
+            assert mock_service.nodes_version == version
+            
+            # A later heartbeat and a node removal both invalidate it
+            mock_service._record_heartbeat(mock_service.nodes["node1"], 1001.0)
+            assert mock_service.nodes_version != version
+            assert client.get('/nodes').get_json()["nodes"]["node1"]["last_heartbeat"] == 1001.0
+            
+            mock_service._remove_node_from_ring("node1")
+            assert client.get('/nodes').get_json() == {"nodes": {}}
+    
+    def test_get_nodes_paginated(self, mock_service):
+        """Test fetching /nodes in pages with limit and offset"""
+        for i in range(5):
+            mock_service._add_node_to_ring({
+                "node_id": f"node{i}",
+                "address": "127.0.0.1",
+                "port": 8080 + i,
+                "last_heartbeat": time.time(),
+                "status": "active"
+            })
+        
+        with mock_service.app.test_client() as client:
+            data = client.get('/nodes?limit=2&offset=1').get_json()
+            assert list(data["nodes"]) == ["node1", "node2"]
+            assert data["total"] == 5
+            
+            data = client.get('/nodes?offset=4').get_json()
+            assert list(data["nodes"]) == ["node4"]
+            
+            assert client.get('/nodes?limit=abc').status_code == 400
+            assert client.get('/nodes?offset=-1').status_code == 400
+    
+    def test_heartbeat_for_known_node_skips_lock(self, mock_service):
+        """Test that an existing node's heartbeat doesn't wait for the node lock"""
+        mock_service._add_node_to_ring({
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": 1000.0,
+            "status": "dead"
+        })
+        responses = []
+        
+        def heartbeat():
+            with mock_service.app.test_client() as client:
+                responses.append(client.post('/heartbeat', json={
+                    "node_id": "node1", "address": "127.0.0.1", "port": 8080
+                }).status_code)
+        
+        # Hold the lock in this thread while another thread sends the heartbeat
+        with mock_service.node_lock:
+            worker = threading.Thread(target=heartbeat)
+            worker.start()
+            worker.join(timeout=2)
+            assert responses == [200]
+        
+        assert mock_service.nodes["node1"].status == STATUS_ACTIVE
+        assert mock_service.nodes["node1"].last_heartbeat > 1000.0
+    
     def test_get_node_for_key_endpoint(self, mock_service):
         """Test getting node responsible for a key"""
         # Add some nodes
@@ -408,6 +800,59 @@ class TestGatewayServiceIntegration:
             assert data["key"] == "test_key"
             assert data["node"]["node_id"] in ["node0", "node1", "node2"]
     
+    def test_lookup_nodes_for_keys_endpoint(self, mock_service):
+        """Test batched lookup of nodes for several keys"""
+        for i in range(3):
+            node_data = {
+                "node_id": f"node{i}",
+                "address": "127.0.0.1",
+                "port": 8080 + i,
+                "last_heartbeat": time.time(),
+                "status": "active"
+            }
+            mock_service._add_node_to_ring(node_data)
+        
+        keys = ["user:1", "user:2", "key/with/slashes"]
+        with mock_service.app.test_client() as client:
+            response = client.post('/nodes/lookup', json={"keys": keys})
+            
+            assert response.status_code == 200
+            mapping = response.get_json()["mapping"]
+            assert set(mapping.keys()) == set(keys)
+            
+            # Batched result should agree with the single-key endpoint
+            single = client.get('/nodes/user:1').get_json()
+            assert mapping["user:1"]["node_id"] == single["node"]["node_id"]
+    
+    def test_lookup_nodes_for_keys_missing_keys(self, mock_service):
+        """Test batched lookup without a keys list"""
+        with mock_service.app.test_client() as client:
+            response = client.post('/nodes/lookup', json={})
+            assert response.status_code == 400
+    
+    def test_ring_status_allows_local_ring_mirror(self, mock_service):
+        """Test that a ring rebuilt from /ring/status agrees with the gateway"""
+        for i in range(3):
+            node_data = {
+                "node_id": f"node{i}",
+                "address": "127.0.0.1",
+                "port": 8080 + i,
+                "last_heartbeat": time.time(),
+                "status": "active"
+            }
+            mock_service._add_node_to_ring(node_data)
+        
+        with mock_service.app.test_client() as client:
+            status = client.get('/ring/status').get_json()
+            
+            local_ring = SimpleHashRing(virtual_nodes=status["virtual_nodes"])
+            for node_id in status["ring_nodes"]:
+                local_ring.add_node(node_id)
+            
+            for key in ["user:1001", "product:2001", "cache:abc"]:
+                remote = client.get(f'/nodes/{key}').get_json()
+                assert local_ring.get_node(key) == remote["node"]["node_id"]
+    
     def test_get_node_for_key_no_nodes(self, mock_service):
         """Test getting node for key when no nodes exist"""
         with mock_service.app.test_client() as client:
@@ -426,4 +871,118 @@ class TestGatewayServiceIntegration:
             data = response.get_json()
             assert "status" in data
             assert "gateway_id" in data
-            assert data["gateway_id"] == "test-gateway" 
\ No newline at end of file
+            assert data["gateway_id"] == "test-gateway" 
+    
+    def test_active_node_count_follows_status_changes(self, mock_service):
+        """Test that the cached active count is refreshed when a status changes"""
+        for node_id in ("node1", "node2"):
+            mock_service._add_node_to_ring({
+                "node_id": node_id,
+                "address": "127.0.0.1",
+                "port": 8080,
+                "last_heartbeat": time.time(),
+                "status": "active"
+            })
+        
+        with mock_service.app.test_client() as client:
+            assert client.get('/health').get_json()["active_nodes"] == 2
+            
+            mock_service.nodes["node1"].status = STATUS_DEAD
+            mock_service.nodes_version += 1
+            assert client.get('/health').get_json()["active_nodes"] == 1
+            
+            mock_service._record_heartbeat(mock_service.nodes["node1"], time.time())
+            assert client.get('/ring/status').get_json()["active_nodes"] == 2
+    
+    def test_gossip_endpoint_accepts_batch(self, mock_service):
+        """Test that the gossip endpoint processes every message in a batch"""
+        for node_id in ("node1", "node2"):
+            mock_service._add_node_to_ring({
+                "node_id": node_id,
+                "address": "127.0.0.1",
+                "port": 8080,
+                "last_heartbeat": 1000.0,
+                "status": "active"
+            })
+        batch = [
+            GossipMessage("HEARTBEAT", "gateway2", {
+                "node_id": node_id, "address": "127.0.0.1", "port": 8080, "timestamp": 2000.0
+            }).to_dict()
+            for node_id in ("node1", "node2")
+        ]
+        
+        with mock_service.app.test_client() as client:
+            response = client.post('/gossip', json={"batch": batch})
+            
+            assert response.status_code == 200
+            assert mock_service.nodes["node1"].last_heartbeat == 2000.0
+            assert mock_service.nodes["node2"].last_heartbeat == 2000.0
+    
+    @pytest.mark.skipif(gateway_service_simple.msgpack is None, reason="msgpack not installed")
+    def test_gossip_endpoint_accepts_msgpack(self, mock_service):
+        """Test that the gossip endpoint decodes msgpack bodies from peers"""
+        mock_service._add_node_to_ring({
+            "node_id": "node1",
+            "address": "127.0.0.1",
+            "port": 8080,
+            "last_heartbeat": 1000.0,
+            "status": "active"
+        })
+        message = GossipMessage("HEARTBEAT", "gateway2", {
+            "node_id": "node1", "address": "127.0.0.1", "port": 8080, "timestamp": 2000.0
+        })
+        
+        with mock_service.app.test_client() as client:
+            response = client.post(
+                '/gossip',
+                data=gateway_service_simple.encode_gossip({"batch": [message.to_dict()]}),
+                headers=gateway_service_simple.GOSSIP_HEADERS
+            )
+            
+            assert response.status_code == 200
+            assert mock_service.nodes["node1"].last_heartbeat == 2000.0
+
+
+class TestRaftGatewayRing:
+    """Ring updates in the Raft-backed gateway (needs raftos)"""
+    
+    @pytest.fixture
+    def service(self):
+        gateway_service = pytest.importorskip("gateway.gateway_service")
+        # Ring updates are exercised directly; no Raft cluster is configured
+        with patch.object(gateway_service.GatewayService, 'setup_raft'):
+            service = gateway_service.GatewayService("test-gateway", 8000, 9000)
+        yield service
+        service.executor.shutdown(wait=False)
+        service.gossip_executor.shutdown(wait=False)
+    
+    def test_add_nodes_rebuilds_table_once(self, service):
+        """Test that a batched add builds the Maglev table a single time"""
+        nodes_list = [
+            {"node_id": f"node{i}", "address": "127.0.0.1", "port": 8080 + i,
+             "last_heartbeat": time.time(), "status": "active"}
+            for i in range(5)
+        ]
+        ring = service.hash_ring
+        
+        with patch.object(ring, '_build_table', wraps=ring._build_table) as build:
+            assert service._add_nodes_to_ring(nodes_list) == True
+        
+        assert build.call_count == 1
+        assert set(service.nodes) == {f"node{i}" for i in range(5)}
+        assert ring.nodes == set(service.nodes)
+        assert service.lookup_node("some-key") in service.nodes
+    
+    def test_add_and_remove_single_node(self, service):
+        """Test that single-node changes keep the node table and ring in step"""
+        node_data = {"node_id": "node1", "address": "127.0.0.1", "port": 8080,
+                     "last_heartbeat": time.time(), "status": "active"}
+        
+        assert service._add_node_to_ring(node_data) == True
+        version = service.nodes_version
+        assert service.lookup_node("key") == "node1"
+        
+        assert service._remove_node_from_ring("node1") == True
+        assert service.nodes_version > version
+        assert "node1" not in service.nodes
+        assert service.lookup_node("key") is None
@@ -4,6 +4,7 @@ Unit tests for SimpleHashRing implementation
 
 import pytest
 from collections import defaultdict, Counter
+from unittest.mock import patch
 from gateway.simple_hash_ring import SimpleHashRing
 
 
@@ -140,6 +141,28 @@ class TestSimpleHashRing:
         # With good hash function, typically < 30% get remapped when adding 1 node to 3
         assert remapped_count < len(test_keys) * 0.5
     
+    def test_lookup_matches_clockwise_scan(self):
+        """Test that binary search finds the first ring key clockwise, wrapping at the end"""
+        ring = SimpleHashRing(virtual_nodes=20)
+        for node in ["node1", "node2", "node3"]:
+            ring.add_node(node)
+        
+        def scan(hash_val):
+            for ring_key in ring.sorted_keys:
+                if ring_key >= hash_val:
+                    return ring.ring[ring_key]
+            return ring.ring[ring.sorted_keys[0]]
+        
+        for i in range(500):
+            key = f"key_{i}"
+            assert ring.get_node(key) == scan(ring._hash(key))
+            assert ring.get_nodes(key, count=1) == [ring.get_node(key)]
+        
+        # Keys hashing past the last ring key wrap to the first one
+        with patch.object(ring, "_hash", return_value=ring.sorted_keys[-1] + 1):
+            assert ring.get_node("wrapped") == ring.ring[ring.sorted_keys[0]]
+            assert ring.get_nodes("wrapped", count=1) == [ring.ring[ring.sorted_keys[0]]]
+    
     def test_key_distribution(self):
         """Test that keys are reasonably distributed across nodes"""
         ring = SimpleHashRing(virtual_nodes=50)
@@ -227,6 +250,7 @@ class TestSimpleHashRing:
         assert hash1 == hash2
         assert isinstance(hash1, int)
         assert hash1 >= 0
+        assert hash1 < 2 ** 64
     
     def test_ring_ordering(self):
         """Test that ring keys are properly sorted"""
@@ -241,6 +265,22 @@ class TestSimpleHashRing:
         # Check that all ring keys are in sorted_keys
         assert set(ring.sorted_keys) == set(ring.ring.keys())
     
+    def test_incremental_updates_match_fresh_ring(self):
+        """Test that merged adds and filtered removes keep the same ring as a rebuild"""
+        ring = SimpleHashRing(virtual_nodes=50)
+        for node in ["node1", "node2", "node3", "node4"]:
+            ring.add_node(node)
+        ring.remove_node("node2")
+        ring.add_node("node5")
+        
+        fresh = SimpleHashRing(virtual_nodes=50)
+        for node in ["node1", "node3", "node4", "node5"]:
+            fresh.add_node(node)
+        
+        assert ring.sorted_keys == fresh.sorted_keys
+        assert ring.ring == fresh.ring
+        assert ring._owners == [ring.ring[key] for key in ring.sorted_keys]
+    
     def test_node_removal_preserves_consistency(self):
         """Test that removing nodes doesn't break consistency for remaining keys"""
         ring = SimpleHashRing(virtual_nodes=20)
@@ -3,10 +3,12 @@ Unit tests for KVStoreService
 """
 
 import pytest
+import json
 import time
 import threading
 from unittest.mock import Mock, patch, MagicMock
-from storage.kvstore.kvstore_service import KVStoreService
+from storage.kvstore import kvstore_service
+from storage.kvstore.kvstore_service import KVStoreService, KVStoreClient, OrjsonProvider
 
 
 class TestKVStoreService:
@@ -24,6 +26,10 @@ class TestKVStoreService:
         assert service.running == False
         assert service.registered == False
         assert service.app is not None
+        
+        # Gateway calls share one retrying keep-alive connection pool
+        adapter = service.gateway_session.get_adapter("http://127.0.0.1:8000/heartbeat")
+        assert adapter.max_retries.total == 3
     
     def test_store_and_retrieve_data(self):
         """Test storing and retrieving key-value pairs"""
@@ -85,7 +91,7 @@ class TestKVStoreService:
             route_found = any(route in r for r in routes)
             assert route_found, f"Route {route} not found in {routes}"
     
-    @patch('storage.kvstore.kvstore_service.requests.post')
+    @patch('requests.Session.post')
     def test_register_with_gateway_success(self, mock_post):
         """Test successful registration with gateway"""
         # Mock successful response
@@ -107,7 +113,7 @@ class TestKVStoreService:
         assert call_args[1]['json']['address'] == "0.0.0.0"
         assert call_args[1]['json']['port'] == 8080
     
-    @patch('storage.kvstore.kvstore_service.requests.post')
+    @patch('requests.Session.post')
     def test_register_with_gateway_failure(self, mock_post):
         """Test failed registration with gateway"""
         # Mock failed response
@@ -123,7 +129,7 @@ class TestKVStoreService:
         assert result == False
         assert service.registered == False
     
-    @patch('storage.kvstore.kvstore_service.requests.post')
+    @patch('requests.Session.post')
     def test_register_with_gateway_network_error(self, mock_post):
         """Test registration with network error"""
         # Mock network exception
@@ -136,7 +142,7 @@ class TestKVStoreService:
         assert result == False
         assert service.registered == False
     
-    @patch('storage.kvstore.kvstore_service.requests.post')
+    @patch('requests.Session.post')
     def test_send_heartbeat_success(self, mock_post):
         """Test successful heartbeat sending"""
         # Mock successful response
@@ -160,8 +166,49 @@ class TestKVStoreService:
         assert heartbeat_data['port'] == 8080
         assert heartbeat_data['key_count'] == 1
         assert 'timestamp' in heartbeat_data
+        
+        # Once a heartbeat is accepted the address is left out
+        assert service._send_heartbeat() == True
+        heartbeat_data = mock_post.call_args[1]['json']
+        assert 'address' not in heartbeat_data
+        assert 'port' not in heartbeat_data
     
-    @patch('storage.kvstore.kvstore_service.requests.post')
+    @patch('requests.Session.post')
+    def test_register_then_heartbeat_with_deferred_add(self, mock_post):
+        """Test heartbeats right after registering, while the gateway is still
+        adding the node, and after the gateway has forgotten it"""
+        known, pending = set(), set()
+        
+        def gateway(url, json=None, **kwargs):
+            # Like the Raft gateway: adds are applied later, and a heartbeat
+            # without an address from an unknown node is rejected
+            known.update(pending)
+            pending.clear()
+            if json["node_id"] in known:
+                return Mock(status_code=200)
+            if "address" not in json:
+                return Mock(status_code=400)
+            pending.add(json["node_id"])
+            return Mock(status_code=200)
+        
+        mock_post.side_effect = gateway
+        service = KVStoreService("node1", 8080, "127.0.0.1:8000")
+        
+        assert service._register_with_gateway() == True
+        assert service._send_heartbeat() == True
+        assert service._send_heartbeat() == True
+        sent = [call[1]['json'] for call in mock_post.call_args_list]
+        assert ['address' in data for data in sent] == [True, True, False]
+        
+        # A gateway that lost the node gets a full heartbeat straight away
+        known.clear()
+        mock_post.reset_mock()
+        assert service._send_heartbeat() == True
+        sent = [call[1]['json'] for call in mock_post.call_args_list]
+        assert ['address' in data for data in sent] == [False, True]
+        assert service.registered == True
+    
+    @patch('requests.Session.post')
     def test_send_heartbeat_failure(self, mock_post):
         """Test failed heartbeat sending"""
         # Mock failed response
@@ -174,7 +221,25 @@ class TestKVStoreService:
         result = service._send_heartbeat()
         
         assert result == False
-
+    
+    def test_registration_retries_back_off_with_jitter(self):
+        """Test that failed registrations wait randomised, capped delays"""
+        service = KVStoreService("node1", 8080, "127.0.0.1:8000")
+        service.running = True
+        delays = []
+        
+        def record_sleep(delay):
+            delays.append(delay)
+            if len(delays) == 20:
+                service.running = False
+        
+        with patch.object(service, '_register_with_gateway', return_value=False), \
+             patch('storage.kvstore.kvstore_service.time.sleep', side_effect=record_sleep):
+            service._heartbeat_loop()
+        
+        assert all(service.registration_retry_interval <= d <= service.registration_retry_cap
+                   for d in delays)
+        assert len(set(delays)) > 1
 
 class TestKVStoreHTTPEndpoints:
     """Test KV store HTTP endpoints using Flask test client"""
@@ -199,7 +264,7 @@ class TestKVStoreHTTPEndpoints:
             
             # Verify data was actually stored
             with service.data_lock:
-                assert service.data["test_key"] == "test_value"
+                assert json.loads(service.data["test_key"]) == "test_value"
     
     def test_put_endpoint_missing_key(self, service):
         """Test PUT operation with missing key"""
@@ -234,13 +299,28 @@ class TestKVStoreHTTPEndpoints:
                 
                 # Verify stored value
                 with service.data_lock:
-                    assert service.data[key] == value
+                    assert json.loads(service.data[key]) == value
+    
+    def test_put_endpoint_large_integer(self, service):
+        """Test that integers beyond 64 bits still round-trip"""
+        if kvstore_service.orjson is not None:
+            assert isinstance(service.app.json, OrjsonProvider)
+        value = 2 ** 70 + 1  # not representable as a float
+        with service.app.test_client() as client:
+            response = client.post('/put',
+                data=json.dumps({"key": "big", "value": value}),
+                content_type='application/json'
+            )
+            assert response.status_code == 200
+            
+            response = client.get('/get/big')
+            assert json.loads(response.data)["value"] == value
     
     def test_get_endpoint_success(self, service):
         """Test successful GET operation"""
         # Store data first
         with service.data_lock:
-            service.data["test_key"] = "test_value"
+            service.data["test_key"] = b'"test_value"'
         
         with service.app.test_client() as client:
             response = client.get('/get/test_key')
@@ -251,6 +331,19 @@ class TestKVStoreHTTPEndpoints:
             assert data["key"] == "test_key"
             assert data["node_id"] == "test-node"
     
+    @pytest.mark.skipif(not kvstore_service._GIL_ENABLED, reason="reads lock without the GIL")
+    def test_get_endpoint_does_not_wait_for_writers(self, service):
+        """Test that point reads are served while the data lock is held"""
+        service.data["test_key"] = b'null'
+        
+        with service.data_lock, service.app.test_client() as client:
+            response = client.get('/get/test_key')
+            assert response.status_code == 200
+            assert response.get_json()["value"] is None
+            
+            response = client.post('/get', json={"key": "missing"})
+            assert response.status_code == 404
+    
     def test_get_endpoint_key_not_found(self, service):
         """Test GET operation for non-existent key"""
         with service.app.test_client() as client:
@@ -288,6 +381,71 @@ class TestKVStoreHTTPEndpoints:
             data = response.get_json()
             assert "error" in data
     
+    def test_bulk_endpoint(self, service):
+        """Test applying several operations in one request"""
+        with service.app.test_client() as client:
+            response = client.post('/bulk', json={"ops": [
+                {"op": "put", "key": "key/with/slashes", "value": "v1"},
+                {"op": "get", "key": "key/with/slashes"},
+                {"op": "delete", "key": "key/with/slashes"},
+                {"op": "get", "key": "key/with/slashes"},
+                {"op": "bogus", "key": "other"}
+            ]})
+            
+            assert response.status_code == 200
+            results = response.get_json()["results"]
+            assert results[0]["status"] == "stored"
+            assert results[1]["value"] == "v1"
+            assert results[2]["status"] == "deleted"
+            assert "error" in results[3]
+            assert "error" in results[4]
+            
+            with service.data_lock:
+                assert "key/with/slashes" not in service.data
+    
+    def test_bulk_endpoint_missing_ops(self, service):
+        """Test bulk request without an ops list"""
+        with service.app.test_client() as client:
+            response = client.post('/bulk', json={})
+            assert response.status_code == 400
+    
+    def test_bulk_endpoint_invalid_op(self, service):
+        """Test that a malformed op fails alone instead of the whole batch"""
+        with service.app.test_client() as client:
+            response = client.post('/bulk', json={"ops": [
+                "not-an-op",
+                {"op": "put", "key": "key1", "value": "v1"}
+            ]})
+            
+            assert response.status_code == 200
+            results = response.get_json()["results"]
+            assert results[0]["error"] == "Invalid op"
+            assert results[1]["status"] == "stored"
+    
+    def test_bulk_endpoint_non_object_body(self, service):
+        """Test that a JSON body that isn't an object is rejected"""
+        with service.app.test_client() as client:
+            for body in (["put", "key1"], "ops", 42):
+                response = client.post('/bulk', json=body)
+                assert response.status_code == 400
+    
+    def test_bulk_endpoint_invalid_key(self, service):
+        """Test that a non-string key fails alone and leaves the other ops applied"""
+        with service.app.test_client() as client:
+            response = client.post('/bulk', json={"ops": [
+                {"op": "put", "key": "key1", "value": "v1"},
+                {"op": "put", "key": ["a", "list"], "value": "v2"},
+                {"op": "get", "key": {"a": "dict"}},
+                {"op": "delete", "key": 7},
+                {"op": "get", "key": "key1"}
+            ]})
+            
+            assert response.status_code == 200
+            results = response.get_json()["results"]
+            assert results[0]["status"] == "stored"
+            assert [r["error"] for r in results[1:4]] == ["Invalid key"] * 3
+            assert results[4]["value"] == "v1"
+    
     def test_keys_endpoint(self, service):
         """Test listing all keys"""
         # Store some data
@@ -343,7 +501,8 @@ class TestKVStoreHTTPEndpoints:
         
         service.registered = True
         
-        with service.app.test_client() as client:
+        # Served without waiting for writers holding the data lock
+        with service.data_lock, service.app.test_client() as client:
             response = client.get('/stats')
             
             assert response.status_code == 200
@@ -498,7 +657,7 @@ class TestKVStoreIntegration:
                 response = client.post('/get', json={"key": key})
                 assert response.status_code == 404
     
-    @patch('storage.kvstore.kvstore_service.requests.post')
+    @patch('requests.Session.post')
     def test_heartbeat_integration(self, mock_post):
         """Test heartbeat integration with data operations"""
         # Mock successful heartbeat
@@ -523,4 +682,117 @@ class TestKVStoreIntegration:
             # Verify heartbeat included correct key count
             call_args = mock_post.call_args
             heartbeat_data = call_args[1]['json']
-            assert heartbeat_data['key_count'] == 5 
\ No newline at end of file
+            assert heartbeat_data['key_count'] == 5 
+
+
+class TestKVStoreClient:
+    """Test KVStoreClient request construction"""
+    
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_put_raw_sends_pre_encoded_value(self, mock_get, mock_post):
+        """Test that put_raw splices the encoded value into a valid JSON body"""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {
+            "node": {"node_id": "node1", "address": "127.0.0.1", "port": 8080}
+        }
+        mock_post.return_value.status_code = 200
+        
+        client = KVStoreClient("127.0.0.1:8000")
+        result = client.put_raw('key "quoted"', b'{"name": "Alice", "age": 25}')
+        
+        assert result == True
+        call_args = mock_post.call_args
+        assert call_args[0][0] == "http://127.0.0.1:8080/put"
+        assert json.loads(call_args[1]['data']) == {
+            "key": 'key "quoted"',
+            "value": {"name": "Alice", "age": 25}
+        }
+    
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_put_delegates_to_put_raw(self, mock_get, mock_post):
+        """Test that put encodes the value and sends it through put_raw"""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {
+            "node": {"node_id": "node1", "address": "127.0.0.1", "port": 8080}
+        }
+        mock_post.return_value.status_code = 200
+        
+        client = KVStoreClient("127.0.0.1:8000")
+        
+        assert client.put("key", [1, "two"]) == True
+        assert json.loads(mock_post.call_args[1]['data']) == {"key": "key", "value": [1, "two"]}
+        
+        # Values that can't be encoded fail without any request being sent
+        mock_post.reset_mock()
+        assert client.put("key", object()) == False
+        mock_post.assert_not_called()
+    
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_node_lookup_cached_until_node_call_fails(self, mock_get, mock_post):
+        """Test that repeated keys skip the gateway until a node call fails"""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {
+            "node": {"node_id": "node1", "address": "127.0.0.1", "port": 8080}
+        }
+        mock_post.return_value.status_code = 200
+        
+        client = KVStoreClient("127.0.0.1:8000")
+        
+        assert client.put_raw("key", b'1') == True
+        assert client.put_raw("key", b'2') == True
+        assert mock_get.call_count == 1
+        
+        # A node that can't be reached sends the next call back to the gateway
+        mock_post.side_effect = ConnectionError("node down")
+        assert client.put_raw("key", b'3') == False
+        mock_post.side_effect = None
+        assert client.put_raw("key", b'4') == True
+        assert mock_get.call_count == 2
+    
+    @patch('requests.Session.post')
+    def test_multi_key_operations_batch_per_node(self, mock_post):
+        """Test that multi-key calls send one /bulk request per node"""
+        nodes = {
+            "a": {"node_id": "node1", "address": "10.0.0.1", "port": 8080},
+            "b": {"node_id": "node2", "address": "10.0.0.2", "port": 8080},
+            "c": {"node_id": "node1", "address": "10.0.0.1", "port": 8080},
+        }
+        store = {}
+        
+        def post(url, json=None, **kwargs):
+            response = Mock(status_code=200)
+            if url.endswith("/nodes/lookup"):
+                response.json.return_value = {"mapping": {k: nodes.get(k) for k in json["keys"]}}
+                return response
+            results = []
+            for op in json["ops"]:
+                if op["op"] == "put":
+                    store[op["key"]] = op["value"]
+                    results.append({"op": "put", "key": op["key"], "status": "stored"})
+                elif op["key"] in store:
+                    results.append({"op": "get", "key": op["key"], "value": store[op["key"]]})
+                else:
+                    results.append({"op": "get", "key": op["key"], "error": "Key not found"})
+            response.json.return_value = {"results": results}
+            return response
+        
+        mock_post.side_effect = post
+        client = KVStoreClient("127.0.0.1:8000")
+        
+        assert client.put_many({"a": 1, "b": [2], "c": None, "unrouted": 4}) == {
+            "a": True, "b": True, "c": True, "unrouted": False
+        }
+        urls = [call[0][0] for call in mock_post.call_args_list]
+        assert urls.count("http://127.0.0.1:8000/nodes/lookup") == 1
+        assert sorted(url for url in urls if url.endswith("/bulk")) == [
+            "http://10.0.0.1:8080/bulk", "http://10.0.0.2:8080/bulk"
+        ]
+        
+        # Resolved keys are cached, so reads go straight to the nodes
+        mock_post.reset_mock()
+        assert client.get_many(["a", "b", "c"]) == {"a": 1, "b": [2], "c": None}
+        assert all(call[0][0].endswith("/bulk") for call in mock_post.call_args_list)
+        client.close()
@@ -0,0 +1,100 @@
+"""
+Unit tests for MaglevRing implementation
+"""
+
+from collections import Counter
+from unittest.mock import patch
+from gateway.maglev_ring import MaglevRing
+
+
+class TestMaglevRing:
+    """Test cases for MaglevRing class"""
+
+    def test_empty_ring(self):
+        """Test that an empty ring maps no keys"""
+        ring = MaglevRing()
+
+        assert len(ring.nodes) == 0
+        assert ring.get_node("any_key") is None
+
+    def test_table_fully_populated(self):
+        """Test that every table slot is assigned to a known node"""
+        ring = MaglevRing(table_size=251)
+        for i in range(3):
+            ring.add_node(f"node{i}")
+
+        assert len(ring.table) == 251
+        assert set(ring.table) == {"node0", "node1", "node2"}
+
+    def test_add_and_remove_node(self):
+        """Test that node membership drives lookups"""
+        ring = MaglevRing(table_size=251)
+
+        ring.add_node("node1")
+        ring.add_node("node1")  # Duplicate has no effect
+        assert ring.nodes == {"node1"}
+        assert ring.get_node("key") == "node1"
+
+        ring.remove_node("node1")
+        ring.remove_node("node1")  # Removing twice has no effect
+        assert ring.get_node("key") is None
+
+    def test_insertion_order_independent(self):
+        """Test that gateways adding nodes in different orders agree"""
+        ring1 = MaglevRing(table_size=251)
+        ring2 = MaglevRing(table_size=251)
+        for node in ["node1", "node2", "node3"]:
+            ring1.add_node(node)
+        for node in ["node3", "node1", "node2"]:
+            ring2.add_node(node)
+
+        assert ring1.table == ring2.table
+
+    def test_even_distribution(self):
+        """Test that table slots are split almost exactly evenly"""
+        ring = MaglevRing(table_size=1009)
+        for i in range(10):
+            ring.add_node(f"node{i}")
+
+        counts = Counter(ring.table)
+        assert max(counts.values()) - min(counts.values()) <= 1
+
+    def test_minimal_disruption_on_removal(self):
+        """Test that removing a node mostly moves only that node's keys"""
+        ring = MaglevRing()
+        for i in range(10):
+            ring.add_node(f"node{i}")
+        keys = [f"key_{i}" for i in range(5000)]
+        before = {key: ring.get_node(key) for key in keys}
+
+        ring.remove_node("node3")
+
+        moved = [key for key in keys if ring.get_node(key) != before[key]]
+        owned = [key for key in keys if before[key] == "node3"]
+        assert set(owned) <= set(moved)
+        # Maglev trades a little extra movement for even load; keep it small
+        assert len(moved) <= len(owned) * 1.1
+
+    def test_bulk_changes_rebuild_once(self):
+        """Test that batched membership changes build the table once"""
+        ring = MaglevRing(table_size=251)
+        with patch.object(ring, "_build_table", wraps=ring._build_table) as build:
+            ring.add_nodes([f"node{i}" for i in range(5)])
+            ring.remove_nodes(["node0", "node1"])
+            ring.remove_nodes(["missing"])  # No change, no rebuild
+
+        assert build.call_count == 2
+        assert ring.table == MaglevRing(251, ["node2", "node3", "node4"]).table
+
+    def test_prepare_applies_only_on_install(self):
+        """Test that a prepared change is invisible until installed"""
+        ring = MaglevRing(table_size=251, nodes=["node1"])
+        old_table = ring.table
+
+        state = ring.prepare(add=["node2"])
+        assert ring.nodes == {"node1"}
+        assert ring.table is old_table
+
+        ring.install(state)
+        assert ring.nodes == {"node1", "node2"}
+        assert set(ring.table) == {"node1", "node2"}
@@ -0,0 +1,102 @@
+"""
+Unit tests for ReadWriteLock
+"""
+
+import pytest
+import threading
+from gateway.rwlock import ReadWriteLock
+
+
+class TestReadWriteLock:
+    """Test cases for ReadWriteLock class"""
+
+    def test_readers_share_the_lock(self):
+        """Test that several threads can hold the read lock at once"""
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=2)
+
+        def reader():
+            with lock.read():
+                inside.wait()  # Only passes if all readers are inside together
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self):
+        """Test that a held write lock blocks other threads' reads and writes"""
+        lock = ReadWriteLock()
+        results = []
+
+        with lock:
+            def other():
+                results.append(lock.acquire(timeout=0.1))
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+
+        assert results == [False]
+
+    def test_reader_blocks_writer(self):
+        """Test that a writer waits for readers to finish"""
+        lock = ReadWriteLock()
+        results = []
+
+        with lock.read():
+            def writer():
+                results.append(lock.acquire(timeout=0.1))
+            thread = threading.Thread(target=writer)
+            thread.start()
+            thread.join()
+
+        assert results == [False]
+        # Once the reader is gone the writer gets in
+        assert lock.acquire(timeout=1)
+        lock.release()
+
+    def test_write_lock_is_reentrant(self):
+        """Test nested writes and reads by the writing thread"""
+        lock = ReadWriteLock()
+
+        with lock:
+            with lock.write():
+                with lock.read():
+                    pass
+
+        # Fully released: another thread can write
+        results = []
+        thread = threading.Thread(target=lambda: results.append(lock.acquire(timeout=1)) or lock.release())
+        thread.start()
+        thread.join()
+        assert results == [True]
+
+    def test_release_by_non_owner_raises(self):
+        """Test that only the owning thread may release the write lock"""
+        lock = ReadWriteLock()
+
+        with pytest.raises(RuntimeError):
+            lock.release()
+
+    def test_nested_read_with_waiting_writer(self):
+        """Test that a reader can re-enter while a writer is queued"""
+        lock = ReadWriteLock()
+        writer_done = threading.Event()
+
+        def writer():
+            with lock:
+                writer_done.set()
+
+        with lock.read():
+            thread = threading.Thread(target=writer)
+            thread.start()
+            while not lock._writers_waiting:
+                pass
+            with lock.read():  # Must not wait behind the queued writer
+                assert not writer_done.is_set()
+
+        thread.join(timeout=2)
+        assert writer_done.is_set()